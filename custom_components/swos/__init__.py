@@ -1,25 +1,56 @@
-
 from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
+
+from .const import (
+    DOMAIN, CONF_HOST, CONF_PORT, CONF_USERNAME, CONF_PASSWORD, CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL,
+    CONF_LINK_INTERVAL, DEFAULT_LINK_INTERVAL, CONF_FLAP_WINDOW, DEFAULT_FLAP_WINDOW,
+    CONF_TOP_N, DEFAULT_TOP_N, POE_ENERGY_STORAGE_KEY, POE_ENERGY_STORAGE_VERSION, CONF_ERROR_THRESHOLD, DEFAULT_ERROR_THRESHOLD, CONF_ERROR_MIN_RATE, DEFAULT_ERROR_MIN_RATE,
+)
+
+# The client, coordinator, services and metrics view are imported when they are
+# first needed, so loading the integration without any entry stays cheap.
+
+PLATFORMS: list[str] = ["sensor", "binary_sensor", "switch", "device_tracker"]
 
-from .const import DOMAIN, CONF_HOST, CONF_PORT, CONF_USERNAME, CONF_PASSWORD, CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
-from .api import SwOSClient
-from .coordinator import SwOSCoordinator
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
-PLATFORMS: list[str] = ["sensor"]
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    from .services import async_setup_services
+
+    await async_setup_services(hass)
+    if getattr(hass, "http", None) is not None:
+        from .metrics import SwOSMetricsView
+
+        hass.http.register_view(SwOSMetricsView(hass))
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    from .api import SwOSClient, async_import_httpx
+    from .coordinator import SwOSCoordinator
+    from .link_watcher import SwOSLinkWatcher
+
     host = entry.data[CONF_HOST]
     port = entry.data.get(CONF_PORT, 80)
     username = entry.data[CONF_USERNAME]
     password = entry.data[CONF_PASSWORD]
     interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    link_interval = entry.options.get(CONF_LINK_INTERVAL, DEFAULT_LINK_INTERVAL)
+    flap_window = entry.options.get(CONF_FLAP_WINDOW, DEFAULT_FLAP_WINDOW)
+    top_n = entry.options.get(CONF_TOP_N, DEFAULT_TOP_N)
+    error_threshold = entry.options.get(CONF_ERROR_THRESHOLD, DEFAULT_ERROR_THRESHOLD)
+    error_min_rate = entry.options.get(CONF_ERROR_MIN_RATE, DEFAULT_ERROR_MIN_RATE)
 
+    await async_import_httpx(hass)
     client = SwOSClient(host, username, password, port)
-    coordinator = SwOSCoordinator(hass, client, interval)
+    coordinator = SwOSCoordinator(hass, client, interval, top_n, error_threshold, error_min_rate)
+    await coordinator.async_load_energy(entry.entry_id)
 
     await coordinator.async_config_entry_first_refresh()
 
@@ -28,13 +59,38 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "coordinator": coordinator,
     }
 
+    if link_interval > 0:
+        watcher = SwOSLinkWatcher(hass, client, entry.entry_id, link_interval, flap_window)
+        lnk = (coordinator.data.get("link") or {}).get("lnk")
+        watcher.async_start(lnk if isinstance(lnk, int) else None)
+        hass.data[DOMAIN][entry.entry_id]["link_watcher"] = watcher
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # entities have registered the endpoints they need; poll only those from now on
+    coordinator.async_enable_demand()
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await Store(hass, POE_ENERGY_STORAGE_VERSION, POE_ENERGY_STORAGE_KEY.format(entry_id=entry.entry_id)).async_remove()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     data = hass.data[DOMAIN].pop(entry.entry_id, None)
     if data:
+        watcher = data.get("link_watcher")
+        if watcher is not None:
+            watcher.async_stop()
+        data["coordinator"].async_stop_profile()
+        # a reload (e.g. options change) must not lose the delayed energy save,
+        # or the restored kWh totals would go backwards
+        await data["coordinator"].async_save_energy()
         await data["client"].close()
     return unload_ok
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import heapq
+from typing import Any, Dict, List, Optional, Tuple
+
+from .const import DEFAULT_TOP_N, LINK_SPEED_MBPS
+
+_COUNTER_WRAP = 1 << 32
+
+
+def port_counter(stats: Dict[str, Any], key: str, index: int) -> Optional[int]:
+    """Return a per-port counter, combining the `<key>h` high register if present."""
+    lo = stats.get(key)
+    if not isinstance(lo, list) or index >= len(lo) or not isinstance(lo[index], int):
+        return None
+    hi = stats.get(f"{key}h")
+    if isinstance(hi, list) and index < len(hi) and isinstance(hi[index], int):
+        return (hi[index] << 32) | lo[index]
+    return lo[index]
+
+
+def counter_delta(stats: Dict[str, Any], key: str, cur: int, prev: int) -> Optional[int]:
+    """Difference between two samples; None if the counter was reset."""
+    delta = cur - prev
+    if delta >= 0:
+        return delta
+    if f"{key}h" not in stats:
+        # plain 32-bit register wrapped around
+        return delta + _COUNTER_WRAP
+    return None
+
+
+class SwOSThroughputTracker:
+    """Turns successive stats.b snapshots into switch-wide throughput figures.
+
+    Only the previous RX/TX byte counters are kept between polls. The busiest
+    ports are selected with a bounded min-heap of `top_n` entries, so a 48 port
+    switch costs one pass and no full sort.
+    """
+
+    def __init__(self, top_n: int = DEFAULT_TOP_N) -> None:
+        self.top_n = top_n
+        self._prev: Optional[Tuple[float, List[Optional[int]], List[Optional[int]]]] = None
+
+    def update(self, data: Dict[str, Any], now: float) -> Optional[Dict[str, Any]]:
+        stats = data.get("stats") or {}
+        rb = stats.get("rb")
+        if not isinstance(rb, list):
+            return None
+
+        ports = len(rb)
+        rx = [port_counter(stats, "rb", i) for i in range(ports)]
+        tx = [port_counter(stats, "tb", i) for i in range(ports)]
+        prev = self._prev
+        self._prev = (now, rx, tx)
+
+        out: Dict[str, Any] = {
+            "rx_rate": None,
+            "tx_rate": None,
+            "peak_utilisation": None,
+            "peak_port": None,
+            "top_ports": [],
+        }
+        if prev is None or now <= prev[0]:
+            return out
+
+        link = data.get("link") or {}
+        spd = link.get("spd") if isinstance(link.get("spd"), list) else []
+        lnk = link.get("lnk")
+
+        elapsed = now - prev[0]
+        _, prev_rx, prev_tx = prev
+        rx_total = 0.0
+        tx_total = 0.0
+        peak: Optional[Tuple[float, int]] = None
+        heap: List[Tuple[float, int, float, float]] = []
+
+        for i in range(min(ports, len(prev_rx))):
+            rx_rate = self._rate(stats, "rb", rx[i], prev_rx[i], elapsed)
+            tx_rate = self._rate(stats, "tb", tx[i], prev_tx[i] if i < len(prev_tx) else None, elapsed)
+            if rx_rate is None and tx_rate is None:
+                continue
+            rx_rate = rx_rate or 0.0
+            tx_rate = tx_rate or 0.0
+            rx_total += rx_rate
+            tx_total += tx_rate
+
+            busy = rx_rate + tx_rate
+            item = (busy, i, rx_rate, tx_rate)
+            if len(heap) < self.top_n:
+                heapq.heappush(heap, item)
+            elif heap and busy > heap[0][0]:
+                heapq.heapreplace(heap, item)
+
+            up = lnk is None or bool((lnk >> i) & 1)
+            speed = LINK_SPEED_MBPS.get(spd[i]) if up and i < len(spd) else None
+            if speed:
+                # full duplex: the busier direction is what saturates the link
+                util = max(rx_rate, tx_rate) * 8 / (speed * 1_000_000) * 100
+                if peak is None or util > peak[0]:
+                    peak = (util, i)
+
+        out["rx_rate"] = round(rx_total, 1)
+        out["tx_rate"] = round(tx_total, 1)
+        if peak is not None:
+            out["peak_utilisation"] = round(peak[0], 2)
+            out["peak_port"] = peak[1] + 1
+        out["top_ports"] = [
+            {"port": i + 1, "rx": round(r, 1), "tx": round(t, 1)}
+            for _, i, r, t in sorted(heap, reverse=True)
+        ]
+        return out
+
+    @staticmethod
+    def _rate(stats: Dict[str, Any], key: str, cur: Optional[int], prev: Optional[int], elapsed: float) -> Optional[float]:
+        if cur is None or prev is None:
+            return None
+        delta = counter_delta(stats, key, cur, prev)
+        if delta is None:
+            return None
+        return delta / elapsed
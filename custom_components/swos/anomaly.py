@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+from .const import (
+    DEFAULT_ERROR_MIN_RATE,
+    DEFAULT_ERROR_THRESHOLD,
+    ERROR_COUNTER_KEYS,
+    ERROR_EWMA_ALPHA,
+    ERROR_WARMUP_SAMPLES,
+)
+from .aggregates import port_counter
+
+
+class _PortErrorState:
+    __slots__ = ("prev", "mean", "var", "samples", "anomalous")
+
+    def __init__(self, prev: int) -> None:
+        self.prev = prev
+        self.mean = 0.0
+        self.var = 0.0
+        self.samples = 0
+        self.anomalous = False
+
+
+class SwOSErrorAnomalyDetector:
+    """Streaming per-port detector for jumps in the stats.b error counters.
+
+    Each port keeps only its previous error total and an exponentially
+    weighted mean/variance of the error rate (errors per minute), so memory is
+    constant per port and every poll is a single pass over the table. A port
+    is anomalous when its rate is at least `min_rate` and more than
+    `threshold` standard deviations above its baseline. The baseline is not
+    updated while a port is anomalous, so it clears once the rate drops back.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_ERROR_THRESHOLD,
+        min_rate: float = DEFAULT_ERROR_MIN_RATE,
+        alpha: float = ERROR_EWMA_ALPHA,
+        keys: Sequence[str] = ERROR_COUNTER_KEYS,
+    ) -> None:
+        self.threshold = threshold
+        self.min_rate = min_rate
+        self.alpha = alpha
+        self.keys = tuple(keys)
+        self._ports: List[Optional[_PortErrorState]] = []
+        self._last: Optional[float] = None
+
+    def _total(self, stats: Dict[str, Any], index: int) -> Optional[int]:
+        total = None
+        for key in self.keys:
+            value = port_counter(stats, key, index)
+            if value is not None:
+                total = (total or 0) + value
+        return total
+
+    def update(self, stats: Dict[str, Any], now: float) -> Dict[str, Any]:
+        """Feed one stats.b snapshot.
+
+        Returns `anomalous_ports` (1-based), `new_anomalies` with the ports that
+        just crossed the threshold and their rate/baseline, and the current
+        `error_rates` of ports that saw errors.
+        """
+        keys = [k for k in self.keys if isinstance(stats.get(k), list)]
+        ports = max((len(stats[k]) for k in keys), default=0)
+        if len(self._ports) < ports:
+            self._ports.extend([None] * (ports - len(self._ports)))
+
+        elapsed = None if self._last is None else now - self._last
+        self._last = now
+
+        anomalous: List[int] = []
+        new_anomalies: List[Dict[str, Any]] = []
+        rates: Dict[int, float] = {}
+        for i in range(ports):
+            total = self._total(stats, i)
+            if total is None:
+                continue
+            state = self._ports[i]
+            if state is None:
+                self._ports[i] = _PortErrorState(total)
+                continue
+
+            delta = total - state.prev
+            state.prev = total
+            if delta < 0 or not elapsed or elapsed <= 0:
+                # counters were cleared or the switch rebooted
+                continue
+
+            rate = delta * 60.0 / elapsed
+            if rate:
+                rates[i + 1] = round(rate, 2)
+
+            was_anomalous = state.anomalous
+            std = math.sqrt(state.var)
+            state.anomalous = (
+                state.samples >= ERROR_WARMUP_SAMPLES
+                and rate >= self.min_rate
+                and rate - state.mean > self.threshold * max(std, 1.0)
+            )
+            if state.anomalous:
+                anomalous.append(i + 1)
+                if not was_anomalous:
+                    new_anomalies.append(
+                        {"port": i + 1, "rate": round(rate, 2), "baseline": round(state.mean, 2)}
+                    )
+                # keep the baseline frozen so a sustained jump stays flagged
+                continue
+
+            # EWMA mean/variance (Finch, "Incremental calculation of weighted mean and variance")
+            diff = rate - state.mean
+            incr = self.alpha * diff
+            state.mean += incr
+            state.var = (1 - self.alpha) * (state.var + diff * incr)
+            state.samples += 1
+
+        return {
+            "anomalous_ports": anomalous,
+            "new_anomalies": new_anomalies,
+            "error_rates": rates,
+        }
@@ -2,17 +2,40 @@
 from __future__ import annotations
 
 import asyncio
+import importlib
 import logging
 import struct
-from typing import Dict, Optional
+import time
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
-import httpx
-import requests
-from requests.auth import HTTPDigestAuth
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import DEFAULT_SECTIONS, HOST_ENDPOINTS, HOST_SECTION, OPTIONAL_SECTIONS, READ_ONLY_FIELDS, WRITE_COALESCE_SECONDS
+
+if TYPE_CHECKING:
+    import httpx
+    from homeassistant.core import HomeAssistant
+
+    from .profiler import SwOSProfiler
+
+# httpx is imported when the first request is made and requests only when
+# that fails, so importing the integration (parsers, consts) stays cheap.
+# Callers on the event loop load httpx first with async_import_httpx.
 
 _LOGGER = logging.getLogger(__name__)
 
 
+async def async_import_httpx(hass: HomeAssistant) -> None:
+    """Import httpx in the executor so the first request does not block the loop."""
+    await hass.async_add_import_executor_job(importlib.import_module, "httpx")
+
+# Profiler of the coordinator refresh that is making the current request. It is
+# set inside the refresh's fetch task only, so the link watcher's polls and the
+# write queue's reads running at the same time are not counted in the cycle.
+active_profiler: ContextVar[Optional[SwOSProfiler]] = ContextVar("swos_active_profiler", default=None)
+
+
 def _hexstr_to_ascii(s: str) -> str:
     try:
         return bytes.fromhex(s).decode("ascii", errors="ignore")
@@ -36,13 +59,8 @@ def _hex_to_mac(hexs: str) -> str:
         return hexs
 
 
-def parse_swos_blob(text: str) -> Dict:
-    t = text.strip()
-    if not (t.startswith("{") and t.endswith("}")):
-        return {}  # reject HTML or anything not a JS-like object
-
-    t = t[1:-1]  # drop braces
-
+def _split_top_level(t: str) -> List[str]:
+    """Split on commas that are not nested inside {...} or [...]."""
     parts = []
     last = 0
     depth = 0
@@ -50,37 +68,68 @@ def parse_swos_blob(text: str) -> Dict:
         if ch == "," and depth == 0:
             parts.append(t[last:i])
             last = i + 1
-        elif ch in "{}":
-            depth += (1 if ch == "{" else -1)
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
     parts.append(t[last:])
+    return parts
 
+
+def _parse_value(key: str, v: str, decode: bool = True) -> Any:
+    v = v.strip()
+    if len(v) >= 2 and v[0] == "[" and v[-1] == "]":
+        # per-port arrays, e.g. link.b `spd:[0x02,0x07,...]`
+        inner = v[1:-1].strip()
+        if not inner:
+            return []
+        return [_parse_value(key, item, decode) for item in _split_top_level(inner)]
+    if len(v) >= 2 and v[0] == "{" and v[-1] == "}":
+        # nested objects, e.g. `sfp:{vnd:'...',...}`
+        return _parse_object(v[1:-1], decode)
+    if v.startswith("0x"):
+        try:
+            return int(v, 16)
+        except ValueError:
+            return v
+    if len(v) >= 2 and v[0] == "'" and v[-1] == "'":
+        raw = v[1:-1]
+        if not decode:
+            return raw
+        if key in ("ver", "id", "brd", "mrkt", "sid"):
+            return _hexstr_to_ascii(raw)
+        if key in ("mac", "rmac"):
+            return _hex_to_mac(raw)
+        return raw
+    # try int fallback
+    try:
+        return int(v)
+    except Exception:
+        return v
+
+
+def _parse_object(t: str, decode: bool = True) -> Dict:
+    """`key:value,...` pairs of an object without its braces."""
     out = {}
-    for p in parts:
+    for p in _split_top_level(t):
         if ":" not in p:
             continue
         k, v = p.split(":", 1)
         key = k.strip()
-        v = v.strip()
+        out[key] = _parse_value(key, v, decode)
+    return out
 
-        if v.startswith("0x"):
-            try:
-                out[key] = int(v, 16)
-            except ValueError:
-                out[key] = v
-        elif len(v) >= 2 and v[0] == "'" and v[-1] == "'":
-            raw = v[1:-1]
-            if key in ("ver", "id", "brd", "mrkt", "sid"):
-                out[key] = _hexstr_to_ascii(raw)
-            elif key in ("mac", "rmac"):
-                out[key] = _hex_to_mac(raw)
-            else:
-                out[key] = raw
-        else:
-            # try int fallback
-            try:
-                out[key] = int(v)
-            except Exception:
-                out[key] = v
+
+def parse_swos_blob(text: str, decode: bool = True) -> Dict:
+    t = text.strip()
+    if not (t.startswith("{") and t.endswith("}")):
+        return {}  # reject HTML or anything not a JS-like object
+
+    out = _parse_object(t[1:-1], decode)
+
+    if not decode:
+        # raw table, e.g. for read-modify-write; no decoded or derived keys
+        return out
 
     # derived
     if "ip" in out and isinstance(out["ip"], int):
@@ -95,63 +144,275 @@ def parse_swos_blob(text: str) -> Dict:
     return out
 
 
+def port_names(link: Dict[str, Any]) -> List[str]:
+    """Port names from link.b (`nm`, hex encoded), or Port1..N if missing."""
+    names = link.get("nm")
+    if isinstance(names, list):
+        return [_hexstr_to_ascii(n) if isinstance(n, str) else str(n) for n in names]
+    spd = link.get("spd")
+    count = len(spd) if isinstance(spd, list) else 0
+    return [f"Port{i + 1}" for i in range(count)]
+
+
+def _format_value(v: Any) -> str:
+    if isinstance(v, dict):
+        return format_swos_blob(v)
+    if isinstance(v, list):
+        return "[" + ",".join(_format_value(item) for item in v) + "]"
+    if isinstance(v, bool):
+        v = int(v)
+    if isinstance(v, int):
+        return f"0x{v:02x}"
+    return f"'{v}'"
+
+
+def format_swos_blob(data: Dict) -> str:
+    """Serialise a raw table (see `parse_swos_blob(..., decode=False)`) for a POST."""
+    return "{" + ",".join(f"{k}:{_format_value(v)}" for k, v in data.items()) + "}"
+
+
+def _apply_changes(table: Dict, changes: Dict[str, Dict[int, Any]]) -> None:
+    """Apply per-port changes to a raw table: bits of a bitmask or array items."""
+    for key, ports in changes.items():
+        current = table.get(key)
+        if isinstance(current, int):
+            for index, value in ports.items():
+                if value:
+                    current |= 1 << index
+                else:
+                    current &= ~(1 << index)
+            table[key] = current
+        elif isinstance(current, list):
+            for index, value in ports.items():
+                if index >= len(current):
+                    raise ValueError(f"Port index {index} out of range for '{key}'")
+                current[index] = value
+        else:
+            raise ValueError(f"Field '{key}' not found in table")
+
+
+def _fail_waiters(waiters: Dict[str, asyncio.Future]) -> None:
+    """Fail write waiters that are still open because the client is closing."""
+    for section, waiter in waiters.items():
+        if not waiter.done():
+            waiter.set_exception(HomeAssistantError(f"Writing {section}.b aborted: connection closed"))
+
+
+def _is_object(text: str) -> bool:
+    """Cheap check for a JS-like object (what parse_swos_blob accepts)."""
+    t = text.strip()
+    return t.startswith("{") and t.endswith("}")
+
+
+def _is_not_served(status: Optional[int], text: str) -> bool:
+    """True for a definite answer without the table (not for failed requests)."""
+    return status == 404 or (status == 200 and bool(text.strip()))
+
+
 class SwOSClient:
     def __init__(self, host: str, username: str, password: str, port: int = 80) -> None:
         self._host = host
         self._port = port
-        self._authx = httpx.DigestAuth(username, password)
-        self._authr = HTTPDigestAuth(username, password)
+        self._username = username
+        self._password = password
+        self._authx: Optional[httpx.DigestAuth] = None
+        self._authr: Any = None
         self._client: Optional[httpx.AsyncClient] = None
+        # set only while a `swos.profile` run is active
+        self.profiler: Optional[SwOSProfiler] = None
+        self._auth_started: Dict[int, float] = {}
+        # optional sections (e.g. poe) the device does not serve
+        self._unsupported: Set[str] = set()
+        # table -> the read currently running for it (see _read_table)
+        self._reads: Dict[str, asyncio.Task] = {}
+        # table -> endpoint it was last read from (`x.b` or `!x.b`), for writes
+        self._endpoints: Dict[str, str] = {}
+        # write queue: section -> field -> port index -> value
+        self._pending: Dict[str, Dict[str, Dict[int, Any]]] = {}
+        # section -> resolved once its pending changes are written (or failed)
+        self._waiters: Dict[str, asyncio.Future] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        # every flush not finished yet, so close() can cancel them
+        self._flushes: Set[asyncio.Task] = set()
+        self._write_lock = asyncio.Lock()
+        # called with the written sections after a flush, e.g. to refresh them
+        self.on_written: Optional[Callable[[Set[str]], Awaitable[None]]] = None
+
+    def set_profiler(self, profiler: Optional[SwOSProfiler]) -> None:
+        self.profiler = profiler
+        if self._client is not None:
+            self._set_hooks(self._client)
+
+    def _set_hooks(self, client: httpx.AsyncClient) -> None:
+        # the request/response hooks time the digest 401 challenge; they are
+        # only installed while profiling
+        if self.profiler is None:
+            client.event_hooks = {"request": [], "response": []}
+            self._auth_started.clear()
+        else:
+            client.event_hooks = {"request": [self._on_request], "response": [self._on_response]}
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        # hooks run in the requesting task, so the context var tells refresh fetches apart
+        if active_profiler.get() is not None:
+            self._auth_started[id(request)] = time.perf_counter()
+
+    async def _on_response(self, response: httpx.Response) -> None:
+        start = self._auth_started.pop(id(response.request), None)
+        profiler = active_profiler.get()
+        if start is not None and response.status_code == 401 and profiler is not None:
+            profiler.add("auth", time.perf_counter() - start)
 
     def _url(self, endpoint: str) -> str:
         return f"http://{self._host}:{self._port}/{endpoint}"
 
     async def _ensure_client(self) -> httpx.AsyncClient:
         if self._client is None:
+            import httpx
+
+            if self._authx is None:
+                self._authx = httpx.DigestAuth(self._username, self._password)
             self._client = httpx.AsyncClient(timeout=10.0, headers={"Accept": "*/*"})
+            if self.profiler is not None:
+                self._set_hooks(self._client)
         return self._client
 
+    def _requests_auth(self) -> Any:
+        # called from the fallback's worker thread, so the import stays off the loop
+        from requests.auth import HTTPDigestAuth
+
+        if self._authr is None:
+            self._authr = HTTPDigestAuth(self._username, self._password)
+        return self._authr
+
     async def close(self) -> None:
+        """Abort queued writes (their callers get HomeAssistantError) and close the connection."""
+        flushes = list(self._flushes)
+        for task in flushes:
+            task.cancel()
+        await asyncio.gather(*flushes, return_exceptions=True)
+        # changes whose flush never got to swap them out
+        _fail_waiters(self._waiters)
+        self._pending, self._waiters = {}, {}
         if self._client is not None:
             await self._client.aclose()
             self._client = None
 
-    async def fetch_blob(self, endpoint: str) -> Optional[str]:
+    async def _get(self, endpoint: str) -> Tuple[Optional[int], str]:
+        """GET `endpoint` as (status, text); status is None if no answer came back."""
         url = self._url(endpoint)
+        status: Optional[int] = None
         try:
             client = await self._ensure_client()
             r = await client.get(url, auth=self._authx)
             preview = (r.text or "")[:120].replace("\\n"," ")
             _LOGGER.debug("httpx %s -> %s bytes, status=%s, head=%r", endpoint, len(r.text or ""), r.status_code, preview)
             if r.status_code == 200 and r.text.strip():
-                return r.text
+                return r.status_code, r.text
+            status = r.status_code
         except Exception as err:
             _LOGGER.warning("httpx failed on %s: %s", endpoint, err)
 
-        def _req() -> Optional[str]:
+        def _req() -> Tuple[Optional[int], str]:
             try:
-                rr = requests.get(url, auth=self._authr, timeout=10, headers={"Accept":"*/*","User-Agent":"swos-ha/0.1.5"})
+                import requests
+
+                rr = requests.get(url, auth=self._requests_auth(), timeout=10, headers={"Accept":"*/*","User-Agent":"swos-ha/0.1.5"})
                 preview = (rr.text or "")[:120].replace("\\n"," ")
                 _LOGGER.debug("requests %s -> %s bytes, status=%s, head=%r", endpoint, len(rr.text or ""), rr.status_code, preview)
-                if rr.status_code == 200 and rr.text.strip():
-                    return rr.text
+                return rr.status_code, rr.text or ""
             except Exception as er:
                 _LOGGER.error("requests fallback failed on %s: %s", endpoint, er)
-            return None
+            return status, ""
 
         return await asyncio.to_thread(_req)
 
-    async def _fetch_one(self, base: str) -> Optional[Dict]:
-        # Try base, then fallback with '!'
-        for ep in (f"{base}.b", f"!{base}.b"):
-            txt = await self.fetch_blob(ep)
-            if not txt:
-                continue
-            parsed = parse_swos_blob(txt)
-            if parsed:
-                return parsed
+    async def fetch_blob(self, endpoint: str) -> Optional[str]:
+        status, txt = await self._get(endpoint)
+        if status == 200 and txt.strip():
+            return txt
         return None
 
+    async def post_blob(self, endpoint: str, body: str) -> bool:
+        url = self._url(endpoint)
+        try:
+            client = await self._ensure_client()
+            r = await client.post(url, content=body, auth=self._authx, headers={"Content-Type": "text/plain"})
+            _LOGGER.debug("httpx POST %s -> status=%s", endpoint, r.status_code)
+            if r.status_code == 200:
+                return True
+        except Exception as err:
+            _LOGGER.warning("httpx POST failed on %s: %s", endpoint, err)
+
+        def _req() -> bool:
+            try:
+                import requests
+
+                rr = requests.post(url, data=body, auth=self._requests_auth(), timeout=10, headers={"Content-Type": "text/plain","User-Agent":"swos-ha/0.1.5"})
+                _LOGGER.debug("requests POST %s -> status=%s", endpoint, rr.status_code)
+                return rr.status_code == 200
+            except Exception as er:
+                _LOGGER.error("requests POST fallback failed on %s: %s", endpoint, er)
+            return False
+
+        return await asyncio.to_thread(_req)
+
+    async def _fetch_one(self, base: str, decode: bool = True) -> Optional[Dict]:
+        parsed, _ = await self._fetch_first(base, decode)
+        return parsed
+
+    async def _fetch_first(self, base: str, decode: bool = True) -> Tuple[Optional[Dict], bool]:
+        """Read and parse the `base` table; returns (parsed, not_served).
+
+        `not_served` is only True if every endpoint answered without the table
+        (404, or a 200 that is no SwOS object, e.g. an HTML page). A failed
+        request leaves it False so the section is tried again next time.
+        """
+        profiler = active_profiler.get()
+        if profiler is None:
+            _, txt, not_served = await self._read_table(base)
+            parsed = parse_swos_blob(txt, decode) if txt else None
+        else:
+            start = time.perf_counter()
+            _, txt, not_served = await self._read_table(base)
+            fetched = time.perf_counter()
+            profiler.add("fetch_blob", fetched - start)
+            parsed = parse_swos_blob(txt, decode) if txt else None
+            if txt:
+                profiler.add("parse_swos_blob", time.perf_counter() - fetched)
+        return parsed or None, not_served
+
+    async def _read_table(self, base: str) -> Tuple[Optional[str], Optional[str], bool]:
+        """(endpoint, text, not_served) of `base.b`, else `!base.b`.
+
+        Single-flight per table: the coordinator's polls, the link watcher and
+        the write queue's reads all join a request that is already running
+        instead of sending another one; each caller parses the text itself.
+        """
+        task = self._reads.get(base)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._read_table_once(base))
+            # a task started eagerly may already be done; never hand that out
+            if not task.done():
+                self._reads[base] = task
+        # shielded so a cancelled caller does not cancel the others' read
+        return await asyncio.shield(task)
+
+    async def _read_table_once(self, base: str) -> Tuple[Optional[str], Optional[str], bool]:
+        try:
+            not_served = True
+            for ep in (f"{base}.b", f"!{base}.b"):
+                status, txt = await self._get(ep)
+                if status == 200 and _is_object(txt):
+                    self._endpoints[base] = ep
+                    return ep, txt, False
+                if not _is_not_served(status, txt):
+                    not_served = False
+            return None, None, not_served
+        finally:
+            if self._reads.get(base) is asyncio.current_task():
+                del self._reads[base]
+
     async def fetch_sys(self) -> Dict:
         parsed = await self._fetch_one("sys")
         if not parsed:
@@ -159,10 +420,122 @@ class SwOSClient:
         _LOGGER.debug("parsed sys keys: %s", list(parsed.keys()))
         return parsed
 
-    async def fetch_all(self) -> Dict:
+    async def fetch_link(self) -> Dict:
+        parsed = await self._fetch_one("link")
+        if not parsed:
+            raise RuntimeError("No link.b endpoint found or auth failed")
+        return parsed
+
+    def is_unsupported(self, base: str) -> bool:
+        """True once the device answered that it does not serve `base`."""
+        return base in self._unsupported
+
+    async def fetch_section(self, base: str) -> Optional[Dict]:
+        if base in self._unsupported:
+            return None
+        parsed, not_served = await self._fetch_first(base)
+        if not_served and base in OPTIONAL_SECTIONS:
+            # e.g. poe.b on a switch without PoE; stop asking for it
+            _LOGGER.debug("Section %s not served by the device, skipping it", base)
+            self._unsupported.add(base)
+        return parsed
+
+    async def fetch_hosts(self) -> Optional[str]:
+        """Raw host.b text (an array of records), parsed by hosts.SwOSHostIndex."""
+        if HOST_SECTION in self._unsupported:
+            return None
+        not_served = True
+        for ep in HOST_ENDPOINTS:
+            status, txt = await self._get(ep)
+            if status == 200 and txt.lstrip().startswith("["):
+                return txt
+            if not _is_not_served(status, txt):
+                not_served = False
+        if not_served:
+            # as for optional sections: don't pay for the failed requests every poll
+            _LOGGER.debug("host.b not served by the device, skipping it")
+            self._unsupported.add(HOST_SECTION)
+        return None
+
+    async def fetch_all(self, sections: Iterable[str] = DEFAULT_SECTIONS) -> Dict:
         data = {}
-        for base in ("sys", "link", "stats"):
-            parsed = await self._fetch_one(base)
+        for base in sections:
+            parsed = await self.fetch_section(base)
             if parsed:
                 data[base] = parsed
         return data
+
+    # ----------------------------
+    # Batched writes
+    # ----------------------------
+    async def queue_write(self, section: str, key: str, index: int, value: Any) -> None:
+        """Queue one port change and wait until it has been written.
+
+        Changes queued within WRITE_COALESCE_SECONDS are merged into a single
+        read-modify-write POST per section (SwOS always takes whole tables).
+        A later change to the same port replaces an earlier pending one.
+        """
+        self._pending.setdefault(section, {}).setdefault(key, {})[index] = value
+        loop = asyncio.get_running_loop()
+        waiter = self._waiters.get(section)
+        if waiter is None:
+            waiter = self._waiters[section] = loop.create_future()
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush_later())
+            self._flushes.add(self._flush_task)
+        await asyncio.shield(waiter)
+
+    async def _flush_later(self) -> None:
+        waiters: Dict[str, asyncio.Future] = {}
+        try:
+            await asyncio.sleep(WRITE_COALESCE_SECONDS)
+            pending, self._pending = self._pending, {}
+            waiters, self._waiters = self._waiters, {}
+            self._flush_task = None
+            await self._flush(pending, waiters)
+        except asyncio.CancelledError:
+            # close() while writing: nobody may be left waiting
+            _fail_waiters(waiters)
+            raise
+        finally:
+            self._flushes.discard(asyncio.current_task())
+
+    async def _flush(self, pending: Dict[str, Dict[str, Dict[int, Any]]], waiters: Dict[str, asyncio.Future]) -> None:
+        written: Set[str] = set()
+        async with self._write_lock:
+            # sections are independent: one failing must not hold back the others
+            for section, changes in pending.items():
+                try:
+                    await self._write_section(section, changes)
+                except Exception as err:
+                    _LOGGER.warning("Writing %s.b failed: %s", section, err)
+                    if not isinstance(err, HomeAssistantError):
+                        err = HomeAssistantError(f"Writing {section}.b failed: {err}")
+                    waiters[section].set_exception(err)
+                else:
+                    written.add(section)
+        if written and self.on_written is not None:
+            try:
+                await self.on_written(written)
+            except Exception as err:
+                _LOGGER.warning("Refresh after write failed: %s", err)
+        for section in written:
+            waiters[section].set_result(None)
+
+    async def _write_section(self, section: str, changes: Dict[str, Dict[int, Any]]) -> None:
+        table = await self._fetch_one(section, decode=False)
+        if not table:
+            raise HomeAssistantError(f"Cannot read {section}.b before writing")
+        try:
+            _apply_changes(table, changes)
+        except ValueError as err:
+            raise HomeAssistantError(f"Cannot write {section}.b: {err}") from err
+        read_only = READ_ONLY_FIELDS.get(section, ())
+        body = {key: value for key, value in table.items() if key not in read_only}
+        # the endpoint that served the read, e.g. `!poe.b` on some firmware
+        endpoint = self._endpoints.get(section, f"{section}.b")
+        if not await self.post_blob(endpoint, format_swos_blob(body)):
+            raise HomeAssistantError(f"Writing {endpoint} failed")
+        # reads already running started before the POST; later callers need a new one
+        self._reads.pop(section, None)
+        _LOGGER.debug("Wrote %s.b: %s", section, changes)
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from homeassistant.components.binary_sensor import BinarySensorEntity, BinarySensorDeviceClass
+from homeassistant.helpers.entity import EntityCategory
+
+from .const import DOMAIN
+from .coordinator import SwOSCoordinator
+from .entity import SwOSEntity
+
+
+# ----------------------------
+# Setup
+# ----------------------------
+async def async_setup_entry(hass, entry, async_add_entities):
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator: SwOSCoordinator = data["coordinator"]
+
+    entities: List[BinarySensorEntity] = [
+        SwOSPortErrorsBinarySensor(
+            coordinator,
+            entry.entry_id,
+            "MikroTik SwOS port errors",
+        ),
+    ]
+
+    async_add_entities(entities)
+
+
+# ----------------------------
+# Error-rate anomaly (any port)
+# ----------------------------
+class SwOSPortErrorsBinarySensor(SwOSEntity, BinarySensorEntity):
+    """On while at least one port's error rate is above its baseline.
+
+    The per-port detail is in `anomalous_ports` and `error_rates` (errors/min);
+    each new anomaly also fires a `swos_port_error_anomaly` event.
+    """
+
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:ethernet-cable-off"
+
+    def __init__(self, coordinator: SwOSCoordinator, entry_id: str, name: str) -> None:
+        super().__init__(coordinator, entry_id, name, "errors", "anomaly")
+
+    @property
+    def is_on(self) -> bool | None:
+        errors = self.coordinator.data.get(self._section) or {}
+        return bool(errors.get("anomalous_ports"))
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any] | None:
+        errors = self.coordinator.data.get(self._section) or {}
+        return {
+            "anomalous_ports": errors.get("anomalous_ports", []),
+            "error_rates": errors.get("error_rates", {}),
+        }
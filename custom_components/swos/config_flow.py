@@ -6,8 +6,13 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
 
-from .const import DOMAIN, CONF_HOST, CONF_PORT, CONF_USERNAME, CONF_PASSWORD, CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
-from .api import SwOSClient
+from .const import (
+    DOMAIN, CONF_HOST, CONF_PORT, CONF_USERNAME, CONF_PASSWORD, CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL,
+    CONF_LINK_INTERVAL, DEFAULT_LINK_INTERVAL, CONF_FLAP_WINDOW, DEFAULT_FLAP_WINDOW,
+    CONF_TOP_N, DEFAULT_TOP_N, CONF_ERROR_THRESHOLD, DEFAULT_ERROR_THRESHOLD, CONF_ERROR_MIN_RATE, DEFAULT_ERROR_MIN_RATE,
+    CONF_MAC_WATCHLIST, DEFAULT_MAC_WATCHLIST,
+)
+from .api import SwOSClient, async_import_httpx
 
 
 class SwOSConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -21,6 +26,7 @@ class SwOSConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             username = user_input[CONF_USERNAME]
             password = user_input[CONF_PASSWORD]
 
+            await async_import_httpx(self.hass)
             client = SwOSClient(host, username, password, port)
             try:
                 data = await client.fetch_sys()
@@ -57,7 +63,16 @@ class SwOSOptionsFlow(config_entries.OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
 
+        options = self.config_entry.options
         schema = vol.Schema({
-            vol.Required(CONF_SCAN_INTERVAL, default=self.config_entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)): int,
+            vol.Required(CONF_SCAN_INTERVAL, default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)): int,
+            # 0 disables the fast link watcher
+            vol.Required(CONF_LINK_INTERVAL, default=options.get(CONF_LINK_INTERVAL, DEFAULT_LINK_INTERVAL)): vol.All(int, vol.Range(min=0)),
+            vol.Required(CONF_FLAP_WINDOW, default=options.get(CONF_FLAP_WINDOW, DEFAULT_FLAP_WINDOW)): vol.All(int, vol.Range(min=1)),
+            vol.Required(CONF_TOP_N, default=options.get(CONF_TOP_N, DEFAULT_TOP_N)): vol.All(int, vol.Range(min=1, max=50)),
+            vol.Required(CONF_ERROR_THRESHOLD, default=options.get(CONF_ERROR_THRESHOLD, DEFAULT_ERROR_THRESHOLD)): vol.All(vol.Coerce(float), vol.Range(min=0.5)),
+            vol.Required(CONF_ERROR_MIN_RATE, default=options.get(CONF_ERROR_MIN_RATE, DEFAULT_ERROR_MIN_RATE)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            # comma separated MACs tracked via the host table
+            vol.Optional(CONF_MAC_WATCHLIST, default=options.get(CONF_MAC_WATCHLIST, DEFAULT_MAC_WATCHLIST)): str,
         })
         return self.async_show_form(step_id="init", data_schema=schema)
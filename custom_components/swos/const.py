@@ -6,3 +6,71 @@ CONF_PORT = "port"
 CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
 CONF_SCAN_INTERVAL = "scan_interval"
+
+# Fast link watcher (polls only the link.b status bitmask)
+CONF_LINK_INTERVAL = "link_interval"
+DEFAULT_LINK_INTERVAL = 5  # seconds, 0 disables the watcher
+CONF_FLAP_WINDOW = "flap_window"
+DEFAULT_FLAP_WINDOW = 300  # seconds
+EVENT_PORT_LINK_CHANGED = "swos_port_link_changed"
+
+# Aggregate throughput / utilisation computed from stats.b deltas
+CONF_TOP_N = "top_n"
+DEFAULT_TOP_N = 5
+# link.b `spd` code -> link speed in Mbit/s
+LINK_SPEED_MBPS = {0: 10, 1: 100, 2: 1000, 3: 10000, 4: 2500, 5: 5000, 6: 25000, 7: 40000}
+
+# Per-port error-rate anomaly detection on stats.b error counters
+# (FCS/CRC, alignment, fragments, jabber, too long, rx/tx drops; absent keys are skipped)
+ERROR_COUNTER_KEYS = ("rfcs", "rae", "rfr", "rjb", "rtl", "rdrp", "tdrp")
+CONF_ERROR_THRESHOLD = "error_threshold"
+DEFAULT_ERROR_THRESHOLD = 4.0  # standard deviations above the EWMA baseline
+CONF_ERROR_MIN_RATE = "error_min_rate"
+DEFAULT_ERROR_MIN_RATE = 10.0  # errors per minute, below this nothing is flagged
+ERROR_EWMA_ALPHA = 0.1
+ERROR_WARMUP_SAMPLES = 3
+EVENT_PORT_ERROR_ANOMALY = "swos_port_error_anomaly"
+
+# Sections fetched on every poll; optional ones are dropped once the device 404s them
+DEFAULT_SECTIONS = ("sys", "link", "stats", "poe")
+OPTIONAL_SECTIONS = ("poe",)
+
+# Port / PoE configuration writes
+WRITE_COALESCE_SECONDS = 0.5
+POE_MODE_OFF = 0
+POE_MODE_AUTO = 1
+# status fields served next to the configuration; like the SwOS web UI, writes
+# leave them out and only send the table's settings
+READ_ONLY_FIELDS = {
+    "link": ("lnk", "spd", "dpx", "fct"),
+    "poe": ("poes", "cur", "pwr"),
+}
+
+# Host (MAC address) table
+HOST_ENDPOINTS = ("host.b", "!host.b")
+CONF_MAC_WATCHLIST = "mac_watchlist"
+DEFAULT_MAC_WATCHLIST = ""
+
+# Demand-driven polling: sys is always fetched, everything else only while an
+# enabled entity needs it. Derived sections map to the endpoints they come from.
+ALWAYS_SECTIONS = ("sys",)
+HOST_SECTION = "host"
+SECTION_ENDPOINTS = {
+    "throughput": ("link", "stats"),
+    "errors": ("stats",),
+    "poe_power": ("poe",),
+}
+
+# Prometheus / OpenMetrics exposition of the cached coordinator data
+METRICS_URL = "/api/swos/metrics"
+
+# PoE power (poe.b `pwr`, per port in 0.1 W) and energy accounting
+POE_POWER_KEY = "pwr"
+POE_POWER_SCALE = 0.1  # W per unit
+POE_ENERGY_MAX_GAP = 600  # seconds; longer gaps between samples are not integrated
+POE_ENERGY_STORAGE_VERSION = 1
+POE_ENERGY_STORAGE_KEY = "swos.poe_energy.{entry_id}"
+POE_ENERGY_SAVE_DELAY = 60  # seconds
+
+# swos.profile modes (kept here so registering services does not load the profiler)
+PROFILE_MODES = ("timing", "cprofile", "tracemalloc")
@@ -1,21 +1,46 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from collections import Counter
 from datetime import timedelta
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Callable, Collection, Dict, Iterable, List, Optional, Tuple
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DEFAULT_SCAN_INTERVAL
-from .api import SwOSClient
+from .const import (
+    DEFAULT_SCAN_INTERVAL, DEFAULT_TOP_N, DEFAULT_ERROR_THRESHOLD, DEFAULT_ERROR_MIN_RATE, EVENT_PORT_ERROR_ANOMALY,
+    ALWAYS_SECTIONS, DEFAULT_SECTIONS, HOST_SECTION,
+    POE_ENERGY_MAX_GAP, POE_ENERGY_STORAGE_KEY, POE_ENERGY_STORAGE_VERSION, POE_ENERGY_SAVE_DELAY,
+)
+from .api import active_profiler
+from .aggregates import SwOSThroughputTracker
+from .anomaly import SwOSErrorAnomalyDetector
+from .hosts import SwOSHostIndex
+from .energy import SwOSPoEEnergyMeter, poe_port_power
+
+if TYPE_CHECKING:
+    from .api import SwOSClient
+    from .profiler import SwOSProfiler
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class SwOSCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
-    def __init__(self, hass: HomeAssistant, client: SwOSClient, interval: int = DEFAULT_SCAN_INTERVAL) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: SwOSClient,
+        interval: int = DEFAULT_SCAN_INTERVAL,
+        top_n: int = DEFAULT_TOP_N,
+        error_threshold: float = DEFAULT_ERROR_THRESHOLD,
+        error_min_rate: float = DEFAULT_ERROR_MIN_RATE,
+    ) -> None:
         super().__init__(
             hass,
             logger=_LOGGER,
@@ -23,15 +48,322 @@ class SwOSCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
             update_interval=timedelta(seconds=interval),
         )
         self.client = client
+        self._throughput = SwOSThroughputTracker(top_n)
+        self._errors = SwOSErrorAnomalyDetector(error_threshold, error_min_rate)
+        self.profiler: Optional[SwOSProfiler] = None
+        self.hosts = SwOSHostIndex()
+        self.client.on_written = self.async_refresh_sections
+        # enabled entities per endpoint; until the platforms are set up every
+        # default section is fetched so they can discover ports and PoE
+        self._endpoint_users: Counter[str] = Counter()
+        self._demand_ready = False
+        self.last_poll_duration: Optional[float] = None
+        # a few missed polls are still integrated, even with long scan intervals
+        self._energy_max_gap = max(POE_ENERGY_MAX_GAP, 3 * interval)
+        self._poe_energy = SwOSPoEEnergyMeter(max_gap=self._energy_max_gap)
+        self._energy_store: Optional[Store] = None
+        # single-flight: section -> the fetch currently running for it, shared
+        # by the poll, write refreshes and swos.refresh
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # set by a profiled poll so only its listener update closes the cycle
+        self._poll_cycle_done = False
+        self._fetched_at: Dict[str, float] = {}
+        # source section -> (blob the derived values were computed from, values)
+        self._derived: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+
+    @property
+    def sections(self) -> Tuple[str, ...]:
+        """Endpoints fetched on each poll."""
+        if not self._demand_ready:
+            return DEFAULT_SECTIONS
+        wanted = [base for base, users in self._endpoint_users.items() if users > 0 and base not in ALWAYS_SECTIONS]
+        return ALWAYS_SECTIONS + tuple(sorted(wanted))
+
+    @callback
+    def async_register_endpoints(self, endpoints: Iterable[str]) -> CALLBACK_TYPE:
+        """Called by each enabled entity; returns the callback to drop its demand."""
+        endpoints = tuple(endpoints)
+        added = [base for base in endpoints if self._endpoint_users[base] == 0]
+        self._endpoint_users.update(endpoints)
+        if self._demand_ready and added:
+            _LOGGER.debug("Endpoints now polled: %s", added)
+            self.hass.async_create_task(self._async_refresh_sections_logged(added))
+
+        @callback
+        def _unregister() -> None:
+            self._endpoint_users.subtract(endpoints)
+            dropped = [base for base in endpoints if self._endpoint_users[base] <= 0]
+            if dropped:
+                _LOGGER.debug("Endpoints no longer polled: %s", dropped)
+
+        return _unregister
+
+    @callback
+    def async_enable_demand(self) -> None:
+        """Switch from fetching everything to fetching what enabled entities need."""
+        self._demand_ready = True
+        missing = [base for base in self.sections if base not in (self.data or {})]
+        _LOGGER.debug("Polling %s", self.sections)
+        if missing:
+            self.hass.async_create_task(self._async_refresh_sections_logged(missing))
+
+    async def _async_fetch_sections(
+        self, sections: Iterable[str], data: Dict[str, Any], profiler: Optional[SwOSProfiler] = None
+    ) -> None:
+        """Fetch `sections` into `data`, joining fetches already in flight.
+
+        Sections nobody is fetching yet are requested together in one new task;
+        concurrent callers wait on that task instead of asking the switch again.
+        Only fetches started with a `profiler` (the poll's) are timed.
+        """
+        sections = tuple(sections)
+        tasks = {self._inflight[base] for base in sections if base in self._inflight}
+        new = tuple(base for base in sections if base not in self._inflight)
+        if new:
+            task = self.hass.async_create_task(self._async_fetch_new(new, profiler))
+            # tasks start eagerly: one that never suspended is already done and
+            # must not be handed to later callers
+            if not task.done():
+                for base in new:
+                    self._inflight[base] = task
+            tasks.add(task)
+        for task in tasks:
+            # shielded so a cancelled caller does not cancel the others' fetch
+            result = await asyncio.shield(task)
+            data.update((base, result[base]) for base in sections if base in result)
+
+    async def _async_fetch_new(self, sections: Tuple[str, ...], profiler: Optional[SwOSProfiler]) -> Dict[str, Any]:
+        try:
+            return await self._async_fetch_new_sections(sections, profiler)
+        finally:
+            # released here rather than in a done callback, which would only
+            # run on the next loop iteration
+            task = asyncio.current_task()
+            for base in sections:
+                if self._inflight.get(base) is task:
+                    del self._inflight[base]
+
+    async def _async_fetch_new_sections(self, sections: Tuple[str, ...], profiler: Optional[SwOSProfiler]) -> Dict[str, Any]:
+        if profiler is not None:
+            # runs in its own task, so this only marks the fetches made below
+            active_profiler.set(profiler)
+        result: Dict[str, Any] = {}
+        blobs = [base for base in sections if base != HOST_SECTION]
+        if blobs:
+            result.update(await self.client.fetch_all(blobs))
+        if HOST_SECTION in sections:
+            if profiler is None:
+                await self._update_hosts(result)
+            else:
+                start = time.perf_counter()
+                await self._update_hosts(result)
+                profiler.add("host", time.perf_counter() - start)
+        now = time.monotonic()
+        for base in result:
+            self._fetched_at[base] = now
+        return result
+
+    def section_age(self, base: str) -> Optional[float]:
+        """Seconds since `base` was last fetched, None if it never was."""
+        fetched_at = self._fetched_at.get(base)
+        return None if fetched_at is None else time.monotonic() - fetched_at
 
     async def _async_update_data(self) -> Dict[str, Any]:
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start_cycle()
+        started = time.perf_counter()
         try:
-            data = await self.client.fetch_all()
+            data: Dict[str, Any] = {}
+            await self._async_fetch_sections(self.sections, data, profiler)
             if not data:
                 raise UpdateFailed("No data from SwOS")
             if "sys" not in data:
                 _LOGGER.warning("Fetched data but missing 'sys' key: %s", list(data.keys()))
+            if profiler is None:
+                self._compute(data, fetched=data.keys())
+            else:
+                start = time.perf_counter()
+                self._compute(data, fetched=data.keys())
+                profiler.add("compute", time.perf_counter() - start)
+                # the base class updates listeners right after this returns
+                self._poll_cycle_done = True
+            self.last_poll_duration = time.perf_counter() - started
             return data
         except Exception as err:
             _LOGGER.error("Update failed: %s", err, exc_info=True)
+            if profiler is not None:
+                # listeners may not run after a failure, close the cycle here
+                self._end_profile_cycle(profiler)
             raise UpdateFailed(str(err)) from err
+
+    async def async_ensure_hosts(self) -> None:
+        """Fetch host.b now unless it is already polled (e.g. for swos.locate_mac)."""
+        if HOST_SECTION not in self.sections:
+            await self._async_fetch_sections((HOST_SECTION,), {})
+
+    async def _update_hosts(self, data: Dict[str, Any]) -> None:
+        text = await self.client.fetch_hosts()
+        if text is None:
+            return
+        changes = self.hosts.update(text)
+        if changes.changed:
+            _LOGGER.debug("host table: %s", changes)
+        data[HOST_SECTION] = {"count": len(self.hosts), **changes._asdict()}
+
+    async def async_refresh_sections(self, sections: Iterable[str]) -> None:
+        """Re-fetch only `sections` (e.g. after a write) and push them to entities.
+
+        Raises UpdateFailed if any of them did not come back. A partial refresh
+        does not reschedule the regular poll, so frequent ones cannot keep the
+        other sections from being polled.
+        """
+        sections = set(sections)
+        fetched: Dict[str, Any] = {}
+        await self._async_fetch_sections(sections, fetched)
+        missing = sorted(base for base in sections if base not in fetched and not self.client.is_unsupported(base))
+        if fetched:
+            # merged after the fetch so a concurrent refresh's results are kept
+            data = dict(self.data or {})
+            data.update(fetched)
+            self._compute(data, sections)
+            if not missing and sections.issuperset(self.sections):
+                self.async_set_updated_data(data)
+            else:
+                self.data = data
+                self.async_update_listeners()
+        if missing:
+            raise UpdateFailed(f"No data from SwOS for {', '.join(missing)}")
+
+    async def _async_refresh_sections_logged(self, sections: Iterable[str]) -> None:
+        # background refreshes (demand changes); the next poll retries anyway
+        try:
+            await self.async_refresh_sections(sections)
+        except UpdateFailed as err:
+            _LOGGER.debug("Refresh failed: %s", err)
+
+    async def async_refresh_stale(self, sections: Optional[Iterable[str]] = None, max_age: Optional[float] = None) -> List[str]:
+        """Refresh `sections` (default: the polled ones) older than `max_age` seconds.
+
+        Without `max_age` every section is fetched, still joining fetches in
+        flight. Returns the sections that were requested.
+        """
+        sections = self.sections if sections is None else tuple(sections)
+        stale = [
+            base for base in sections
+            if max_age is None or (age := self.section_age(base)) is None or age > max_age
+        ]
+        if stale:
+            await self.async_refresh_sections(stale)
+        return stale
+
+    def _compute(self, data: Dict[str, Any], fetched: Collection[str]) -> None:
+        """Update derived sections whose source was fetched in this round."""
+        self._derive(data, fetched, "stats", self._compute_stats)
+        self._derive(data, fetched, "poe", self._compute_poe)
+
+    def _derive(
+        self,
+        data: Dict[str, Any],
+        fetched: Collection[str],
+        source: str,
+        compute: Callable[[Dict[str, Any]], Dict[str, Any]],
+    ) -> None:
+        blob = data.get(source)
+        if source not in fetched or not blob:
+            return
+        cached = self._derived.get(source)
+        if cached is None or cached[0] is not blob:
+            # a blob shared by joined fetches must only be counted once, or the
+            # rate trackers would see it again with a near-zero interval
+            cached = (blob, compute(data))
+            self._derived[source] = cached
+        data.update(cached[1])
+
+    def _compute_stats(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        now = time.monotonic()
+        derived: Dict[str, Any] = {}
+        throughput = self._throughput.update(data, now)
+        if throughput is not None:
+            derived["throughput"] = throughput
+        derived["errors"] = self._update_errors(data["stats"], now)
+        return derived
+
+    def _compute_poe(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        power = poe_port_power(data["poe"])
+        if power is None:
+            return {}
+        derived = {"poe_power": self._poe_energy.update(power, dt_util.utcnow().timestamp())}
+        if self._energy_store is not None:
+            self._energy_store.async_delay_save(self._poe_energy.as_dict, POE_ENERGY_SAVE_DELAY)
+        return derived
+
+    async def async_load_energy(self, entry_id: str) -> None:
+        """Restore accumulated PoE energy for this entry before the first refresh."""
+        self._energy_store = Store(self.hass, POE_ENERGY_STORAGE_VERSION, POE_ENERGY_STORAGE_KEY.format(entry_id=entry_id))
+        self._poe_energy = SwOSPoEEnergyMeter.from_dict(await self._energy_store.async_load(), self._energy_max_gap)
+
+    async def async_save_energy(self) -> None:
+        """Write the accumulated energy now instead of after the save delay (e.g. on unload)."""
+        if self._energy_store is not None:
+            await self._energy_store.async_save(self._poe_energy.as_dict())
+
+    @callback
+    def async_update_listeners(self) -> None:
+        profiler = self.profiler
+        if profiler is None or not self._poll_cycle_done:
+            # partial refreshes and service calls are not part of the cycle
+            super().async_update_listeners()
+            return
+        self._poll_cycle_done = False
+        start = time.perf_counter()
+        super().async_update_listeners()
+        profiler.add("entity_updates", time.perf_counter() - start)
+        self._end_profile_cycle(profiler)
+
+    @callback
+    def _end_profile_cycle(self, profiler: SwOSProfiler) -> None:
+        profiler.end_cycle()
+        if profiler.done and self.profiler is profiler:
+            self.profiler = None
+            self.client.set_profiler(None)
+            self.hass.async_create_task(self._async_finish_profile(profiler))
+
+    @callback
+    def async_start_profile(self, cycles: int, mode: str) -> None:
+        """Profile the next `cycles` refreshes; the report lands in the config dir."""
+        from .profiler import SwOSProfiler
+
+        self.async_stop_profile()
+        profiler = SwOSProfiler(cycles, mode)
+        self.profiler = profiler
+        self.client.set_profiler(profiler)
+
+    @callback
+    def async_stop_profile(self) -> None:
+        """Abandon a running profile (entry unload or replaced by a new one)."""
+        profiler = self.profiler
+        if profiler is None:
+            return
+        self.profiler = None
+        self.client.set_profiler(None)
+        profiler.stop()
+
+    async def _async_finish_profile(self, profiler: SwOSProfiler) -> None:
+        from .profiler import async_write_report
+
+        entry_id = self.config_entry.entry_id if self.config_entry else "unknown"
+        name = self.config_entry.title if self.config_entry else self.name
+        await async_write_report(self.hass, entry_id, name, profiler)
+
+    def _update_errors(self, stats: Dict[str, Any], now: float) -> Dict[str, Any]:
+        errors = self._errors.update(stats, now)
+        entry_id = self.config_entry.entry_id if self.config_entry else None
+        timestamp = dt_util.utcnow().isoformat()
+        for anomaly in errors.pop("new_anomalies"):
+            _LOGGER.warning("Error rate jump on port %s: %s/min (baseline %s/min)", anomaly["port"], anomaly["rate"], anomaly["baseline"])
+            self.hass.bus.async_fire(
+                EVENT_PORT_ERROR_ANOMALY,
+                {"entry_id": entry_id, **anomaly, "timestamp": timestamp},
+            )
+        return errors
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from homeassistant.components.device_tracker import ScannerEntity, SourceType
+
+from .const import DOMAIN, CONF_MAC_WATCHLIST, DEFAULT_MAC_WATCHLIST
+from .coordinator import SwOSCoordinator
+from .entity import SwOSEntity
+from .hosts import parse_mac_list
+
+
+# ----------------------------
+# Setup
+# ----------------------------
+async def async_setup_entry(hass, entry, async_add_entities):
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator: SwOSCoordinator = data["coordinator"]
+
+    watchlist = parse_mac_list(entry.options.get(CONF_MAC_WATCHLIST, DEFAULT_MAC_WATCHLIST))
+    entities: List[ScannerEntity] = [
+        SwOSMacTracker(coordinator, entry.entry_id, mac) for mac in watchlist
+    ]
+
+    async_add_entities(entities)
+
+
+# ----------------------------
+# Watched MAC address (from the switch's host table)
+# ----------------------------
+class SwOSMacTracker(SwOSEntity, ScannerEntity):
+    """Home while the MAC is in the switch's host table; attributes say where."""
+
+    # the MAC is on the watchlist on purpose; ScannerEntity would create it
+    # disabled unless a device with that MAC connection is already registered
+    _attr_entity_registry_enabled_default = True
+
+    # not SwOSEntity's switch device: ScannerEntity's device_info is final and
+    # it links the tracker to the device owning the MAC itself
+    device_info = ScannerEntity.device_info
+
+    def __init__(self, coordinator: SwOSCoordinator, entry_id: str, mac: str) -> None:
+        super().__init__(coordinator, entry_id, f"MikroTik SwOS {mac}", "host", mac.replace(":", ""))
+        self._mac = mac
+
+    @property
+    def unique_id(self) -> str | None:
+        # ScannerEntity would use the bare MAC; the same MAC may be watched on several switches
+        return self._attr_unique_id
+
+    @property
+    def entity_registry_enabled_default(self) -> bool:
+        # ScannerEntity overrides the property, so the attribute is not read otherwise
+        return self._attr_entity_registry_enabled_default
+
+    @property
+    def source_type(self) -> SourceType:
+        return SourceType.ROUTER
+
+    @property
+    def mac_address(self) -> str:
+        return self._mac
+
+    @property
+    def is_connected(self) -> bool:
+        return self._mac in self.coordinator.hosts
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any] | None:
+        location = self.coordinator.hosts.locate(self._mac)
+        if location is None:
+            return None
+        return {"port": location.port, "vlan": location.vlan}
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
+
+from .const import DOMAIN, SECTION_ENDPOINTS
+from .coordinator import SwOSCoordinator
+
+
+def _stable_id_from_sys(sysd: dict) -> str | None:
+    serial = sysd.get("sid")
+    mac = (sysd.get("mac") or sysd.get("rmac") or "")
+    mac = mac.lower().replace(":", "").replace("-", "")
+    return serial or mac or None
+
+
+# ----------------------------
+# Base entity shared by all platforms
+# ----------------------------
+class SwOSEntity(CoordinatorEntity[SwOSCoordinator]):
+    """Coordinator entity bound to one section of the SwOS data (e.g. `sys`).
+
+    `_endpoints` are the SwOS tables the section is built from. While the
+    entity is enabled (added to hass) the coordinator polls them; disabled
+    entities cost no requests.
+    """
+
+    _attr_has_entity_name = False
+
+    def __init__(
+        self,
+        coordinator: SwOSCoordinator,
+        entry_id: str,
+        name: str,
+        section: str,
+        unique_suffix: str,
+    ) -> None:
+        super().__init__(coordinator)
+        self._entry_id = entry_id
+        self._section = section
+        self._attr_name = name
+
+        sysd = coordinator.data.get("sys", {}) or {}
+        stable = _stable_id_from_sys(sysd) or entry_id
+        self._attr_unique_id = f"{stable}_{section}_{unique_suffix}"
+        self._endpoints: Tuple[str, ...] = SECTION_ENDPOINTS.get(section, (section,))
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_register_endpoints(self._endpoints))
+
+    @property
+    def available(self) -> bool:
+        return self.coordinator.last_update_success and (self._section in self.coordinator.data)
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        sysd = self.coordinator.data.get("sys", {}) or {}
+
+        ip = sysd.get("ip_str") or sysd.get("cip_str") or "unknown"
+        model = sysd.get("brd") or "MikroTik SwOS"
+        sw_ver = sysd.get("ver")
+        bld = sysd.get("bld")
+        serial = sysd.get("sid")
+        raw_mac = (sysd.get("mac") or sysd.get("rmac") or "")
+        mac = raw_mac.lower().replace("-", ":")
+
+        config_url = f"http://{ip}" if ip != "unknown" else None
+        
+        stable_id = serial or mac or ip
+
+        sw_version = f"{sw_ver} ({bld})" if sw_ver and bld else sw_ver 
+        connections = {(CONNECTION_NETWORK_MAC, mac)} if mac else None
+
+        return DeviceInfo(
+            identifiers={(DOMAIN, f"swos_{stable_id}")},
+            manufacturer="MikroTik",
+            model=model,
+            name=f"SwOS {ip}",
+            configuration_url=config_url,
+            sw_version=sw_version,
+            serial_number=serial,
+            connections=connections,
+        )
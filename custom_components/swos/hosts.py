@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# host.b is an array of small objects, e.g.
+#   [{adr:'d401c3eff705',prt:0x03,vid:0x0001},{adr:...},...]
+# which parse_swos_blob cannot handle. The regexes below walk it record by
+# record without building the intermediate string list.
+_RECORD_RE = re.compile(r"\{([^{}]*)\}")
+_FIELD_RE = re.compile(r"(\w+)\s*:\s*('([^']*)'|0x[0-9a-fA-F]+|-?\d+)")
+_MAC_HEX_RE = re.compile(r"[^0-9a-f]")
+
+
+class HostLocation(NamedTuple):
+    port: int  # 1-based
+    vlan: int
+
+
+class HostChanges(NamedTuple):
+    added: int = 0
+    moved: int = 0
+    removed: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.moved or self.removed)
+
+
+def normalize_mac(mac: str) -> Optional[str]:
+    """Return `aa:bb:cc:dd:ee:ff` for any common MAC notation, else None."""
+    hexs = _MAC_HEX_RE.sub("", mac.lower())
+    if len(hexs) != 12:
+        return None
+    return ":".join(hexs[i:i + 2] for i in range(0, 12, 2))
+
+
+def parse_mac_list(text: str) -> List[str]:
+    """Comma/space separated MACs (e.g. from the options flow), normalised."""
+    macs = []
+    for item in re.split(r"[,\s;]+", text or ""):
+        mac = normalize_mac(item) if item else None
+        if mac and mac not in macs:
+            macs.append(mac)
+    return macs
+
+
+def iter_host_entries(text: str) -> Iterator[Tuple[str, HostLocation]]:
+    """Stream (mac, location) pairs out of a host.b response."""
+    for record in _RECORD_RE.finditer(text):
+        adr = None
+        prt = None
+        vid = 0
+        for field in _FIELD_RE.finditer(record.group(1)):
+            key, value, quoted = field.group(1), field.group(2), field.group(3)
+            if key == "adr" and quoted is not None:
+                adr = quoted
+            elif key == "prt":
+                prt = int(value, 0)
+            elif key == "vid":
+                vid = int(value, 0)
+        if adr is None or prt is None:
+            continue
+        mac = normalize_mac(adr)
+        if mac is not None:
+            yield mac, HostLocation(prt + 1, vid)
+
+
+class SwOSHostIndex:
+    """MAC -> (port, VLAN) index kept in sync with the switch's host table.
+
+    Each poll is diffed into the existing dict instead of rebuilding it, and
+    an unchanged response is skipped entirely, so `locate` stays an O(1) dict
+    lookup with no rescans.
+    """
+
+    def __init__(self) -> None:
+        self._table: Dict[str, HostLocation] = {}
+        self._last_text: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __contains__(self, mac: str) -> bool:
+        return mac in self._table
+
+    def locate(self, mac: str) -> Optional[HostLocation]:
+        return self._table.get(mac)
+
+    def update(self, text: str) -> HostChanges:
+        if text == self._last_text:
+            return HostChanges()
+        self._last_text = text
+
+        table = self._table
+        seen = set()
+        added = moved = 0
+        for mac, location in iter_host_entries(text):
+            if mac in seen:
+                # same MAC learned in several VLANs: keep the first entry
+                continue
+            seen.add(mac)
+            previous = table.get(mac)
+            if previous != location:
+                table[mac] = location
+                if previous is None:
+                    added += 1
+                else:
+                    moved += 1
+
+        gone = [mac for mac in table if mac not in seen] if len(seen) != len(table) else []
+        for mac in gone:
+            del table[mac]
+        return HostChanges(added, moved, len(gone))
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from datetime import timedelta
+from typing import TYPE_CHECKING, Callable, Deque, Dict, Iterator, List, Optional
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .const import DEFAULT_FLAP_WINDOW, DEFAULT_LINK_INTERVAL, EVENT_PORT_LINK_CHANGED
+
+if TYPE_CHECKING:
+    from .api import SwOSClient
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def iter_set_bits(mask: int) -> Iterator[int]:
+    """Yield the zero-based index of every set bit, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class SwOSLinkWatcher:
+    """Polls only the `lnk` bitmask of link.b and reports port transitions.
+
+    The heavy stats.b table stays on the coordinator's scan interval; this
+    watcher runs every few seconds so link flaps are seen quickly. Every
+    transition fires `swos_port_link_changed` and is counted per port over a
+    sliding window of `flap_window` seconds.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: SwOSClient,
+        entry_id: str,
+        interval: int = DEFAULT_LINK_INTERVAL,
+        flap_window: int = DEFAULT_FLAP_WINDOW,
+    ) -> None:
+        self.hass = hass
+        self.client = client
+        self.entry_id = entry_id
+        self.interval = interval
+        self.flap_window = flap_window
+        self.mask: Optional[int] = None
+        self._flaps: Dict[int, Deque[float]] = {}
+        self._listeners: List[Callable[[], None]] = []
+        self._unsub: Optional[CALLBACK_TYPE] = None
+        self._polling = False
+        # bumped whenever the mask or flap counts change (e.g. for caches)
+        self.revision = 0
+
+    @callback
+    def async_start(self, mask: Optional[int] = None) -> None:
+        """Start polling; `mask` seeds the baseline (e.g. from the coordinator)."""
+        if mask is not None and self.mask is None:
+            self.mask = mask
+        self._unsub = async_track_time_interval(
+            self.hass, self._async_poll, timedelta(seconds=self.interval), cancel_on_shutdown=True
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        self._listeners.append(update_callback)
+
+        @callback
+        def _remove() -> None:
+            self._listeners.remove(update_callback)
+
+        return _remove
+
+    async def _async_poll(self, _now=None) -> None:
+        if self._polling:
+            # previous request still waiting on the switch, skip this tick
+            return
+        self._polling = True
+        try:
+            link = await self.client.fetch_link()
+        except Exception as err:
+            _LOGGER.debug("Link poll failed: %s", err)
+            return
+        finally:
+            self._polling = False
+
+        mask = link.get("lnk")
+        if not isinstance(mask, int):
+            _LOGGER.debug("link.b has no 'lnk' bitmask: %s", list(link.keys()))
+            return
+        self.async_process_mask(mask)
+
+    @callback
+    def async_process_mask(self, mask: int, now: Optional[float] = None) -> List[int]:
+        """Diff `mask` against the previous one; return the changed ports (1-based)."""
+        if now is None:
+            now = time.monotonic()
+
+        pruned = self._prune(now)
+        first = self.mask is None
+        changed_ports: List[int] = []
+        if not first:
+            changed = self.mask ^ mask
+            timestamp = dt_util.utcnow().isoformat()
+            for bit in iter_set_bits(changed):
+                port = bit + 1
+                new_state = bool((mask >> bit) & 1)
+                flaps = self._flaps.setdefault(port, deque())
+                flaps.append(now)
+                changed_ports.append(port)
+                self.hass.bus.async_fire(
+                    EVENT_PORT_LINK_CHANGED,
+                    {
+                        "entry_id": self.entry_id,
+                        "port": port,
+                        "old_state": "down" if new_state else "up",
+                        "new_state": "up" if new_state else "down",
+                        "timestamp": timestamp,
+                        "flaps": len(flaps),
+                    },
+                )
+        self.mask = mask
+
+        if first or changed_ports or pruned:
+            self.revision += 1
+            for update_callback in list(self._listeners):
+                update_callback()
+        return changed_ports
+
+    def _prune(self, now: float) -> bool:
+        """Drop transitions older than the window; True if any count changed."""
+        horizon = now - self.flap_window
+        pruned = False
+        for port in list(self._flaps):
+            flaps = self._flaps[port]
+            while flaps and flaps[0] < horizon:
+                flaps.popleft()
+                pruned = True
+            if not flaps:
+                del self._flaps[port]
+        return pruned
+
+    def link_up(self, port: int) -> Optional[bool]:
+        if self.mask is None:
+            return None
+        return bool((self.mask >> (port - 1)) & 1)
+
+    def flap_counts(self) -> Dict[int, int]:
+        """Transitions per port within the window (ports without flaps omitted)."""
+        return {port: len(flaps) for port, flaps in sorted(self._flaps.items())}
+
+    def flap_count(self, port: int) -> int:
+        flaps = self._flaps.get(port)
+        return len(flaps) if flaps else 0
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, ERROR_COUNTER_KEYS, LINK_SPEED_MBPS, METRICS_URL
+from .aggregates import port_counter
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# name -> (type, help); rendered in this order
+FAMILIES: Dict[str, Tuple[str, str]] = {
+    "swos_up": ("gauge", "1 if the last poll of the switch succeeded"),
+    "swos_poll_duration_seconds": ("gauge", "Wall time of the last coordinator poll"),
+    "swos_temperature_celsius": ("gauge", "Internal temperature"),
+    "swos_uptime_seconds": ("gauge", "Time since boot"),
+    "swos_port_link_up": ("gauge", "1 if the port has link"),
+    "swos_port_enabled": ("gauge", "1 if the port is administratively enabled"),
+    "swos_port_speed_mbps": ("gauge", "Negotiated link speed"),
+    "swos_port_receive_bytes": ("counter", "Bytes received on the port"),
+    "swos_port_transmit_bytes": ("counter", "Bytes transmitted on the port"),
+    "swos_port_errors": ("counter", "Port error counters from stats.b by kind"),
+    "swos_port_link_flaps": ("gauge", "Link transitions within the flap window"),
+    "swos_receive_rate_bytes": ("gauge", "Switch-wide receive rate in bytes per second"),
+    "swos_transmit_rate_bytes": ("gauge", "Switch-wide transmit rate in bytes per second"),
+    "swos_peak_port_utilisation_ratio": ("gauge", "Utilisation of the busiest port (0-1)"),
+    "swos_port_error_anomaly": ("gauge", "1 while the port's error rate is anomalous"),
+    "swos_host_table_entries": ("gauge", "Entries in the MAC address table"),
+    "swos_port_poe_power_watts": ("gauge", "PoE output power"),
+    "swos_port_poe_energy_kwh": ("counter", "PoE energy delivered since tracking started"),
+}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Dict[str, Any]) -> str:
+    return ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+
+
+def render_metrics(devices: Iterable[Tuple[Dict[str, str], Dict[str, Any], Dict[str, Any]]]) -> str:
+    """Render OpenMetrics text for `(labels, data, extra)` per device.
+
+    `data` is a coordinator snapshot; `extra` carries what is kept outside of
+    it (`up`, `poll_duration`, `flaps`). One pass over the devices fills the
+    families, which are then written in a fixed order.
+    """
+    samples: Dict[str, List[str]] = {name: [] for name in FAMILIES}
+
+    def add(name: str, labels: Dict[str, Any], value: Any, suffix: str = "") -> None:
+        if value is None:
+            return
+        samples[name].append(f"{name}{suffix}{{{_labels(labels)}}} {value}")
+
+    for device, data, extra in devices:
+        add("swos_up", device, int(bool(extra.get("up"))))
+        add("swos_poll_duration_seconds", device, extra.get("poll_duration"))
+
+        sysd = data.get("sys") or {}
+        add("swos_temperature_celsius", device, sysd.get("temp_c"))
+        upt = sysd.get("uptime_seconds")
+        # `upt` is reported in centiseconds
+        add("swos_uptime_seconds", device, upt / 100 if isinstance(upt, int) else None)
+
+        link = data.get("link") or {}
+        stats = data.get("stats") or {}
+        lnk = link.get("lnk")
+        en = link.get("en")
+        spd = link.get("spd") if isinstance(link.get("spd"), list) else []
+        rb = stats.get("rb") if isinstance(stats.get("rb"), list) else []
+        ports = max(len(spd), len(rb))
+        flaps = extra.get("flaps") or {}
+        anomalous = set((data.get("errors") or {}).get("anomalous_ports", []))
+        error_keys = [k for k in ERROR_COUNTER_KEYS if isinstance(stats.get(k), list)]
+
+        for i in range(ports):
+            port = {**device, "port": i + 1}
+            if isinstance(lnk, int):
+                add("swos_port_link_up", port, (lnk >> i) & 1)
+            if isinstance(en, int):
+                add("swos_port_enabled", port, (en >> i) & 1)
+            if i < len(spd):
+                add("swos_port_speed_mbps", port, LINK_SPEED_MBPS.get(spd[i]))
+            if stats:
+                add("swos_port_receive_bytes", port, port_counter(stats, "rb", i), "_total")
+                add("swos_port_transmit_bytes", port, port_counter(stats, "tb", i), "_total")
+                for key in error_keys:
+                    add("swos_port_errors", {**port, "kind": key}, port_counter(stats, key, i), "_total")
+            if "errors" in data:
+                add("swos_port_error_anomaly", port, int(i + 1 in anomalous))
+            if extra.get("flaps") is not None:
+                add("swos_port_link_flaps", port, flaps.get(i + 1, 0))
+
+        throughput = data.get("throughput") or {}
+        add("swos_receive_rate_bytes", device, throughput.get("rx_rate"))
+        add("swos_transmit_rate_bytes", device, throughput.get("tx_rate"))
+        peak = throughput.get("peak_utilisation")
+        add("swos_peak_port_utilisation_ratio", device, None if peak is None else round(peak / 100, 4))
+        add("swos_host_table_entries", device, (data.get("host") or {}).get("count"))
+
+        poe_power = data.get("poe_power") or {}
+        for i, (watts, kwh) in enumerate(zip(poe_power.get("port_power", []), poe_power.get("port_energy", []))):
+            port = {**device, "port": i + 1}
+            add("swos_port_poe_power_watts", port, watts)
+            add("swos_port_poe_energy_kwh", port, kwh, "_total")
+
+    out: List[str] = []
+    for name, (kind, help_text) in FAMILIES.items():
+        if not samples[name]:
+            continue
+        out.append(f"# TYPE {name} {kind}")
+        out.append(f"# HELP {name} {help_text}")
+        out.extend(samples[name])
+    out.append("# EOF")
+    return "\n".join(out) + "\n"
+
+
+class SwOSMetricsView(HomeAssistantView):
+    """Serves all switches' cached coordinator data as OpenMetrics text.
+
+    Nothing is requested from the switches here. The rendered text is reused
+    until any coordinator publishes a new snapshot or a link watcher sees a
+    change in the flap counts.
+    """
+
+    url = METRICS_URL
+    name = "api:swos:metrics"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._cache_key: Optional[List[Tuple[str, Any, bool, Optional[int]]]] = None
+        self._cache_text = ""
+
+    def _snapshot_key(self) -> List[Tuple[str, Any, bool, Optional[int]]]:
+        key = []
+        for entry_id, data in self.hass.data.get(DOMAIN, {}).items():
+            coordinator = data["coordinator"]
+            # flaps come from the watcher, which updates between coordinator refreshes
+            watcher = data.get("link_watcher")
+            revision = watcher.revision if watcher is not None else None
+            key.append((entry_id, coordinator.data, coordinator.last_update_success, revision))
+        return key
+
+    def _is_cached(self, key: List[Tuple[str, Any, bool, Optional[int]]]) -> bool:
+        cached = self._cache_key
+        if cached is None or len(cached) != len(key):
+            return False
+        # the coordinator replaces its data dict on every refresh, so identity is enough
+        return all(
+            a[0] == b[0] and a[1] is b[1] and a[2] == b[2] and a[3] == b[3]
+            for a, b in zip(cached, key)
+        )
+
+    def render(self) -> str:
+        key = self._snapshot_key()
+        if self._is_cached(key):
+            return self._cache_text
+
+        devices = []
+        for entry_id, data in self.hass.data.get(DOMAIN, {}).items():
+            coordinator = data["coordinator"]
+            snapshot = coordinator.data or {}
+            sysd = snapshot.get("sys") or {}
+            entry = self.hass.config_entries.async_get_entry(entry_id)
+            labels = {
+                "entry_id": entry_id,
+                "device": entry.title if entry else entry_id,
+                "ip": sysd.get("ip_str") or sysd.get("cip_str") or "",
+            }
+            watcher = data.get("link_watcher")
+            extra = {
+                "up": coordinator.last_update_success,
+                "poll_duration": coordinator.last_poll_duration,
+                "flaps": watcher.flap_counts() if watcher is not None else None,
+            }
+            devices.append((labels, snapshot, extra))
+
+        self._cache_text = render_metrics(devices)
+        self._cache_key = key
+        return self._cache_text
+
+    async def get(self, request: web.Request) -> web.Response:
+        return web.Response(body=self.render().encode("utf-8"), headers={"Content-Type": CONTENT_TYPE})
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import pstats
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+from homeassistant.components import persistent_notification
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import PROFILE_MODES
+
+_LOGGER = logging.getLogger(__name__)
+
+# Order of the stages in reports; anything else is appended after these.
+STAGES = ("auth", "fetch_blob", "parse_swos_blob", "host", "compute", "entity_updates")
+
+
+class SwOSProfiler:
+    """Collects per-stage wall time for the next `cycles` coordinator refreshes.
+
+    The coordinator and client only hold a reference to a profiler while one
+    is running; when it is None nothing is timed. Only requests made by the
+    coordinator's refresh are counted. `fetch_blob` includes the digest
+    handshake, which is also reported on its own as `auth` (the 401 challenge
+    round trips); `host` is the host.b fetch plus the MAC index update.
+    """
+
+    def __init__(self, cycles: int = 3, mode: str = "timing") -> None:
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}")
+        self.cycles = cycles
+        self.mode = mode
+        self.results: List[Dict[str, List[float]]] = []
+        self.totals: List[float] = []
+        self._current: Optional[Dict[str, List[float]]] = None
+        self._start = 0.0
+        self._profile: Optional[cProfile.Profile] = None
+        self._started_tracemalloc = False
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+
+    @property
+    def in_cycle(self) -> bool:
+        return self._current is not None
+
+    @property
+    def done(self) -> bool:
+        return len(self.totals) >= self.cycles
+
+    def start_cycle(self) -> None:
+        self._current = {}
+        if self.mode == "cprofile":
+            if self._profile is None:
+                self._profile = cProfile.Profile()
+            self._profile.enable()
+        elif self.mode == "tracemalloc" and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            self._started_tracemalloc = True
+        self._start = time.perf_counter()
+
+    def add(self, stage: str, seconds: float) -> None:
+        if self._current is not None:
+            self._current.setdefault(stage, []).append(seconds)
+
+    def end_cycle(self) -> None:
+        if self._current is None:
+            return
+        self.totals.append(time.perf_counter() - self._start)
+        self.results.append(self._current)
+        self._current = None
+        if self._profile is not None:
+            self._profile.disable()
+        if self.mode == "tracemalloc" and tracemalloc.is_tracing():
+            self._snapshot = tracemalloc.take_snapshot()
+        if self.done and self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def stop(self) -> None:
+        """Release cProfile / tracemalloc of a run that will not be finished."""
+        self._current = None
+        if self._profile is not None:
+            self._profile.disable()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _stage_names(self) -> List[str]:
+        seen = {name for cycle in self.results for name in cycle}
+        return [s for s in STAGES if s in seen] + sorted(seen.difference(STAGES))
+
+    def summary(self) -> List[str]:
+        """One line per stage: mean time per cycle and number of calls."""
+        cycles = max(len(self.results), 1)
+        lines = []
+        for name in self._stage_names():
+            spent = sum(sum(cycle.get(name, [])) for cycle in self.results)
+            calls = sum(len(cycle.get(name, [])) for cycle in self.results)
+            lines.append(f"{name}: {spent / cycles * 1000:.1f} ms/cycle ({calls} calls)")
+        if self.totals:
+            lines.append(f"total: {sum(self.totals) / len(self.totals) * 1000:.1f} ms/cycle")
+        return lines
+
+    def report(self, title: str) -> str:
+        out = io.StringIO()
+        out.write(f"{title}\n")
+        out.write(f"cycles: {len(self.totals)}, mode: {self.mode}\n\n")
+        out.write("Mean per cycle\n")
+        for line in self.summary():
+            out.write(f"  {line}\n")
+
+        out.write("\nPer cycle (ms)\n")
+        for n, (cycle, total) in enumerate(zip(self.results, self.totals), start=1):
+            stages = ", ".join(
+                f"{name} {sum(cycle[name]) * 1000:.1f} x{len(cycle[name])}"
+                for name in self._stage_names()
+                if name in cycle
+            )
+            out.write(f"  #{n}: total {total * 1000:.1f}; {stages}\n")
+
+        if self._profile is not None:
+            # the event loop keeps running other tasks while a refresh awaits,
+            # so this also contains whatever else ran during the cycles
+            out.write("\ncProfile of SwOSCoordinator._async_update_data (cumulative, top 40)\n")
+            stats = pstats.Stats(self._profile, stream=out)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(40)
+
+        if self._snapshot is not None:
+            out.write("\ntracemalloc, last cycle (top 25 by size)\n")
+            for stat in self._snapshot.statistics("lineno")[:25]:
+                out.write(f"  {stat}\n")
+
+        return out.getvalue()
+
+
+async def async_write_report(hass: HomeAssistant, entry_id: str, name: str, profiler: SwOSProfiler) -> str:
+    """Write the full report into the config dir and summarise it in a notification."""
+    stamp = dt_util.now().strftime("%Y%m%d_%H%M%S")
+    path = hass.config.path(f"swos_profile_{entry_id}_{stamp}.txt")
+    report = profiler.report(f"SwOS profile for {name} ({entry_id}) at {stamp}")
+
+    def _write() -> None:
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(report)
+
+    await hass.async_add_executor_job(_write)
+    _LOGGER.info("SwOS profile written to %s", path)
+
+    summary = "\n".join(f"- {line}" for line in profiler.summary())
+    persistent_notification.async_create(
+        hass,
+        f"{len(profiler.totals)} refresh cycles of **{name}**:\n\n{summary}\n\nFull report: `{path}`",
+        title="SwOS profile",
+        notification_id=f"swos_profile_{entry_id}",
+    )
+    return path
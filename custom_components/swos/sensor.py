@@ -2,26 +2,20 @@ from __future__ import annotations
 
 from typing import Optional, List, Any, Dict
 
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
-from homeassistant.const import UnitOfTemperature
-from homeassistant.helpers.entity import DeviceInfo, EntityCategory
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
+from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
+from homeassistant.const import PERCENTAGE, UnitOfDataRate, UnitOfEnergy, UnitOfPower, UnitOfTemperature
+from homeassistant.helpers.entity import EntityCategory
 
 from .const import DOMAIN
 from .coordinator import SwOSCoordinator
+from .entity import SwOSEntity
+from .link_watcher import SwOSLinkWatcher
 
 from .formatters import BaseFormatter, DateTimeFormatterFromMiliseconds
 
 # ----------------------------
 # Setup
 # ----------------------------
-def _stable_id_from_sys(sysd: dict) -> str | None:
-    serial = sysd.get("sid")
-    mac = (sysd.get("mac") or sysd.get("rmac") or "")
-    mac = mac.lower().replace(":", "").replace("-", "")
-    return serial or mac or None
-    
 async def async_setup_entry(hass, entry, async_add_entities):
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator: SwOSCoordinator = data["coordinator"]
@@ -79,15 +73,114 @@ async def async_setup_entry(hass, entry, async_add_entities):
         )      
     ]
 
+    entities += [
+        # Switch-wide aggregates computed from stats.b deltas in the coordinator
+        SwOSSimpleSensor(
+            coordinator,
+            entry.entry_id,
+            "MikroTik SwOS RX throughput",
+            "throughput",
+            ["rx_rate"],
+            UnitOfDataRate.BYTES_PER_SECOND,
+            device_class=SensorDeviceClass.DATA_RATE,
+            icon="mdi:download-network",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        SwOSSimpleSensor(
+            coordinator,
+            entry.entry_id,
+            "MikroTik SwOS TX throughput",
+            "throughput",
+            ["tx_rate"],
+            UnitOfDataRate.BYTES_PER_SECOND,
+            device_class=SensorDeviceClass.DATA_RATE,
+            icon="mdi:upload-network",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        SwOSAttributesSensor(
+            coordinator,
+            entry.entry_id,
+            "MikroTik SwOS peak port utilisation",
+            "throughput",
+            ["peak_utilisation"],
+            attribute_keys=["peak_port", "top_ports"],
+            unit=PERCENTAGE,
+            icon="mdi:gauge",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+    ]
+
+    poe_power = coordinator.data.get("poe_power")
+    if poe_power:
+        entities += [
+            SwOSSimpleSensor(
+                coordinator,
+                entry.entry_id,
+                "MikroTik SwOS PoE power",
+                "poe_power",
+                ["power"],
+                UnitOfPower.WATT,
+                device_class=SensorDeviceClass.POWER,
+                icon="mdi:flash",
+                state_class=SensorStateClass.MEASUREMENT,
+            ),
+            SwOSSimpleSensor(
+                coordinator,
+                entry.entry_id,
+                "MikroTik SwOS PoE energy",
+                "poe_power",
+                ["energy"],
+                UnitOfEnergy.KILO_WATT_HOUR,
+                device_class=SensorDeviceClass.ENERGY,
+                state_class=SensorStateClass.TOTAL_INCREASING,
+            ),
+        ]
+        for index in range(len(poe_power.get("port_power", []))):
+            entities += [
+                SwOSPortSensor(
+                    coordinator,
+                    entry.entry_id,
+                    f"MikroTik SwOS port {index + 1} PoE power",
+                    "poe_power",
+                    "port_power",
+                    index,
+                    UnitOfPower.WATT,
+                    device_class=SensorDeviceClass.POWER,
+                    state_class=SensorStateClass.MEASUREMENT,
+                ),
+                SwOSPortSensor(
+                    coordinator,
+                    entry.entry_id,
+                    f"MikroTik SwOS port {index + 1} PoE energy",
+                    "poe_power",
+                    "port_energy",
+                    index,
+                    UnitOfEnergy.KILO_WATT_HOUR,
+                    device_class=SensorDeviceClass.ENERGY,
+                    state_class=SensorStateClass.TOTAL_INCREASING,
+                ),
+            ]
+
+    watcher: SwOSLinkWatcher | None = data.get("link_watcher")
+    if watcher is not None:
+        entities.append(
+            SwOSLinkFlapsSensor(
+                coordinator,
+                entry.entry_id,
+                watcher,
+                "MikroTik SwOS link flaps",
+                icon="mdi:swap-vertical",
+                entity_category=EntityCategory.DIAGNOSTIC,
+            )
+        )
+
     async_add_entities(entities)
 
 
 # ----------------------------
 # Base simple sensor
 # ----------------------------
-class SwOSSimpleSensor(CoordinatorEntity[SwOSCoordinator], SensorEntity):
-    _attr_has_entity_name = False
-
+class SwOSSimpleSensor(SwOSEntity, SensorEntity):
     def __init__(
         self,
         coordinator: SwOSCoordinator,
@@ -99,16 +192,10 @@ class SwOSSimpleSensor(CoordinatorEntity[SwOSCoordinator], SensorEntity):
         device_class: Optional[str] = None,
         icon: Optional[str] = None,
         entity_category: EntityCategory | None = None,
+        state_class: SensorStateClass | None = None,
     ) -> None:
-        super().__init__(coordinator)
-        self._entry_id = entry_id
-        self._section = section
+        super().__init__(coordinator, entry_id, name, section, "_".join(keys))
         self._keys = keys
-        self._attr_name = name
-
-        sysd = coordinator.data.get("sys", {}) or {}
-        stable = _stable_id_from_sys(sysd) or entry_id
-        self._attr_unique_id = f"{stable}_{section}_{'_'.join(keys)}"
 
         if unit:
             self._attr_native_unit_of_measurement = unit
@@ -118,40 +205,8 @@ class SwOSSimpleSensor(CoordinatorEntity[SwOSCoordinator], SensorEntity):
             self._attr_icon = icon
         if entity_category:
             self._attr_entity_category = entity_category
-
-    @property
-    def available(self) -> bool:
-        return self.coordinator.last_update_success and (self._section in self.coordinator.data)
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        sysd = self.coordinator.data.get("sys", {}) or {}
-
-        ip = sysd.get("ip_str") or sysd.get("cip_str") or "unknown"
-        model = sysd.get("brd") or "MikroTik SwOS"
-        sw_ver = sysd.get("ver")
-        bld = sysd.get("bld")
-        serial = sysd.get("sid")
-        raw_mac = (sysd.get("mac") or sysd.get("rmac") or "")
-        mac = raw_mac.lower().replace("-", ":")
-
-        config_url = f"http://{ip}" if ip != "unknown" else None
-        
-        stable_id = serial or mac or ip
-
-        sw_version = f"{sw_ver} ({bld})" if sw_ver and bld else sw_ver 
-        connections = {(CONNECTION_NETWORK_MAC, mac)} if mac else None
-
-        return DeviceInfo(
-            identifiers={(DOMAIN, f"swos_{stable_id}")},
-            manufacturer="MikroTik",
-            model=model,
-            name=f"SwOS {ip}",
-            configuration_url=config_url,
-            sw_version=sw_version,
-            serial_number=serial,
-            connections=connections,
-        )
+        if state_class:
+            self._attr_state_class = state_class
 
     def _base_value(self) -> Any:
         data = self.coordinator.data.get(self._section, {})
@@ -223,3 +278,142 @@ class SwOSFormattedSensor(SwOSSimpleSensor):
             return None
         raw = self._base_value()
         return {self._raw_attr: raw}
+
+
+# ----------------------------
+# Sensor with extra section keys as attributes
+# ----------------------------
+class SwOSAttributesSensor(SwOSSimpleSensor):
+    """A simple sensor that also exposes other keys of its section as attributes."""
+
+    def __init__(
+        self,
+        coordinator: SwOSCoordinator,
+        entry_id: str,
+        name: str,
+        section: str,
+        keys: List[str],
+        attribute_keys: List[str],
+        unit: Optional[str] = None,
+        device_class: Optional[str] = None,
+        icon: Optional[str] = None,
+        entity_category: EntityCategory | None = None,
+        state_class: SensorStateClass | None = None,
+    ) -> None:
+        super().__init__(
+            coordinator,
+            entry_id,
+            name,
+            section,
+            keys,
+            unit=unit,
+            device_class=device_class,
+            icon=icon,
+            entity_category=entity_category,
+            state_class=state_class,
+        )
+        self._attribute_keys = attribute_keys
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any] | None:
+        data = self.coordinator.data.get(self._section, {}) or {}
+        return {k: data.get(k) for k in self._attribute_keys}
+
+
+# ----------------------------
+# Per-port value from a list in the section
+# ----------------------------
+class SwOSPortSensor(SwOSSimpleSensor):
+    """One port's item of a per-port list (e.g. `poe_power['port_power']`).
+
+    Disabled by default; the switch-wide totals cover most dashboards.
+    """
+
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: SwOSCoordinator,
+        entry_id: str,
+        name: str,
+        section: str,
+        key: str,
+        index: int,
+        unit: Optional[str] = None,
+        device_class: Optional[str] = None,
+        icon: Optional[str] = None,
+        state_class: SensorStateClass | None = None,
+    ) -> None:
+        super().__init__(
+            coordinator,
+            entry_id,
+            name,
+            section,
+            [key, str(index + 1)],
+            unit=unit,
+            device_class=device_class,
+            icon=icon,
+            state_class=state_class,
+        )
+        self._key = key
+        self._index = index
+
+    def _base_value(self) -> Any:
+        values = (self.coordinator.data.get(self._section) or {}).get(self._key)
+        if isinstance(values, list) and self._index < len(values):
+            return values[self._index]
+        return None
+
+
+# ----------------------------
+# Link flaps (fed by the fast link watcher)
+# ----------------------------
+class SwOSLinkFlapsSensor(SwOSSimpleSensor):
+    """Number of link transitions within the watcher's flap window.
+
+    Updated by SwOSLinkWatcher as soon as a transition is seen, not only on
+    the coordinator's scan interval. Per-port counts are exposed in `ports`.
+    """
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: SwOSCoordinator,
+        entry_id: str,
+        watcher: SwOSLinkWatcher,
+        name: str,
+        icon: Optional[str] = None,
+        entity_category: EntityCategory | None = None,
+    ) -> None:
+        super().__init__(
+            coordinator,
+            entry_id,
+            name,
+            "link",
+            ["lnk_flaps"],
+            icon=icon,
+            entity_category=entity_category,
+        )
+        self._watcher = watcher
+        # fed by the watcher's own link.b polls, not the coordinator's
+        self._endpoints = ()
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self._watcher.async_add_listener(self.async_write_ha_state))
+
+    @property
+    def available(self) -> bool:
+        return self._watcher.mask is not None
+
+    @property
+    def native_value(self):
+        return sum(self._watcher.flap_counts().values())
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any] | None:
+        return {
+            "window_seconds": self._watcher.flap_window,
+            "ports": self._watcher.flap_counts(),
+        }
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+
+from .api import port_names
+from .const import DEFAULT_SECTIONS, DOMAIN, HOST_SECTION, PROFILE_MODES
+from .hosts import normalize_mac
+
+SERVICE_PROFILE = "profile"
+SERVICE_LOCATE_MAC = "locate_mac"
+SERVICE_REFRESH = "refresh"
+
+ATTR_ENTRY_ID = "entry_id"
+ATTR_CYCLES = "cycles"
+ATTR_MODE = "mode"
+ATTR_MAC = "mac"
+ATTR_SECTIONS = "sections"
+ATTR_MAX_AGE = "max_age"
+
+PROFILE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_ENTRY_ID): cv.string,
+    vol.Optional(ATTR_CYCLES, default=3): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+    vol.Optional(ATTR_MODE, default="timing"): vol.In(PROFILE_MODES),
+})
+
+LOCATE_MAC_SCHEMA = vol.Schema({
+    vol.Required(ATTR_MAC): cv.string,
+})
+
+REFRESH_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_ENTRY_ID): cv.string,
+    vol.Optional(ATTR_SECTIONS): vol.All(cv.ensure_list, [vol.In(DEFAULT_SECTIONS + (HOST_SECTION,))]),
+    vol.Optional(ATTR_MAX_AGE): vol.All(vol.Coerce(float), vol.Range(min=0)),
+})
+
+
+def _entry_data(hass: HomeAssistant, entry_id: str) -> dict:
+    data = hass.data.get(DOMAIN, {}).get(entry_id)
+    if data is None:
+        raise ServiceValidationError(f"No loaded SwOS entry with id {entry_id}")
+    return data
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services (once, shared by all entries)."""
+
+    async def _async_profile(call: ServiceCall) -> None:
+        coordinator = _entry_data(hass, call.data[ATTR_ENTRY_ID])["coordinator"]
+        coordinator.async_start_profile(call.data[ATTR_CYCLES], call.data[ATTR_MODE])
+
+    async def _async_locate_mac(call: ServiceCall) -> ServiceResponse:
+        mac = normalize_mac(call.data[ATTR_MAC])
+        if mac is None:
+            raise ServiceValidationError(f"Invalid MAC address {call.data[ATTR_MAC]!r}")
+
+        locations = []
+        for entry_id, data in hass.data.get(DOMAIN, {}).items():
+            coordinator = data["coordinator"]
+            await coordinator.async_ensure_hosts()
+            location = coordinator.hosts.locate(mac)
+            if location is None:
+                continue
+            names = port_names((coordinator.data or {}).get("link") or {})
+            entry = hass.config_entries.async_get_entry(entry_id)
+            locations.append({
+                "entry_id": entry_id,
+                "switch": entry.title if entry else None,
+                "port": location.port,
+                "port_name": names[location.port - 1] if location.port <= len(names) else None,
+                "vlan": location.vlan,
+            })
+        return {"mac": mac, "locations": locations}
+
+    async def _async_refresh(call: ServiceCall) -> None:
+        if ATTR_ENTRY_ID in call.data:
+            entry_ids = [call.data[ATTR_ENTRY_ID]]
+        else:
+            entry_ids = list(hass.data.get(DOMAIN, {}))
+        coordinators = [_entry_data(hass, entry_id)["coordinator"] for entry_id in entry_ids]
+        results = await asyncio.gather(
+            *(
+                coordinator.async_refresh_stale(call.data.get(ATTR_SECTIONS), call.data.get(ATTR_MAX_AGE))
+                for coordinator in coordinators
+            ),
+            return_exceptions=True,
+        )
+        failed = [f"{entry_id}: {result}" for entry_id, result in zip(entry_ids, results) if isinstance(result, Exception)]
+        if failed:
+            raise HomeAssistantError(f"SwOS refresh failed ({'; '.join(failed)})")
+
+    hass.services.async_register(DOMAIN, SERVICE_PROFILE, _async_profile, schema=PROFILE_SCHEMA)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_LOCATE_MAC,
+        _async_locate_mac,
+        schema=LOCATE_MAC_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(DOMAIN, SERVICE_REFRESH, _async_refresh, schema=REFRESH_SCHEMA)
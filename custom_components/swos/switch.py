@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from homeassistant.components.switch import SwitchEntity
+from homeassistant.helpers.entity import EntityCategory
+
+from .api import port_names
+from .const import DOMAIN, POE_MODE_AUTO, POE_MODE_OFF
+from .coordinator import SwOSCoordinator
+from .entity import SwOSEntity
+
+
+# ----------------------------
+# Setup
+# ----------------------------
+async def async_setup_entry(hass, entry, async_add_entities):
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator: SwOSCoordinator = data["coordinator"]
+
+    link = coordinator.data.get("link") or {}
+    names = port_names(link)
+    entities: List[SwitchEntity] = []
+
+    if isinstance(link.get("en"), int):
+        entities += [
+            SwOSPortEnableSwitch(coordinator, entry.entry_id, index, port_name)
+            for index, port_name in enumerate(names)
+        ]
+
+    poe = (coordinator.data.get("poe") or {}).get("poe")
+    if isinstance(poe, list):
+        entities += [
+            SwOSPoESwitch(coordinator, entry.entry_id, index, names[index] if index < len(names) else None)
+            for index in range(len(poe))
+        ]
+
+    async_add_entities(entities)
+
+
+# ----------------------------
+# Per-port switches (written through the client's batched queue)
+# ----------------------------
+class SwOSPortSwitch(SwOSEntity, SwitchEntity):
+    """A per-port field of a SwOS table: a bit of a bitmask or an array item.
+
+    Toggles go through `SwOSClient.queue_write`, so several ports switched at
+    once end up in one POST of the table followed by one refresh of it.
+    """
+
+    _attr_entity_category = EntityCategory.CONFIG
+    # one switch per port adds up quickly; users enable the ports they need
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: SwOSCoordinator,
+        entry_id: str,
+        name: str,
+        section: str,
+        key: str,
+        index: int,
+        port_name: Optional[str] = None,
+        icon: Optional[str] = None,
+    ) -> None:
+        super().__init__(coordinator, entry_id, name, section, f"{key}_{index + 1}")
+        self._key = key
+        self._index = index
+        self._port_name = port_name
+        if icon:
+            self._attr_icon = icon
+
+    def _raw_value(self) -> Any:
+        value = (self.coordinator.data.get(self._section) or {}).get(self._key)
+        if isinstance(value, int):
+            return (value >> self._index) & 1
+        if isinstance(value, list) and self._index < len(value):
+            return value[self._index]
+        return None
+
+    @property
+    def available(self) -> bool:
+        return super().available and self._raw_value() is not None
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any] | None:
+        return {"port": self._index + 1, "port_name": self._port_name}
+
+    async def _async_write(self, value: Any) -> None:
+        await self.coordinator.client.queue_write(self._section, self._key, self._index, value)
+
+
+class SwOSPortEnableSwitch(SwOSPortSwitch):
+    def __init__(self, coordinator: SwOSCoordinator, entry_id: str, index: int, port_name: Optional[str] = None) -> None:
+        super().__init__(
+            coordinator,
+            entry_id,
+            f"MikroTik SwOS port {index + 1}",
+            "link",
+            "en",
+            index,
+            port_name,
+            icon="mdi:ethernet",
+        )
+
+    @property
+    def is_on(self) -> bool | None:
+        raw = self._raw_value()
+        return None if raw is None else bool(raw)
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        await self._async_write(1)
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        await self._async_write(0)
+
+
+class SwOSPoESwitch(SwOSPortSwitch):
+    def __init__(self, coordinator: SwOSCoordinator, entry_id: str, index: int, port_name: Optional[str] = None) -> None:
+        super().__init__(
+            coordinator,
+            entry_id,
+            f"MikroTik SwOS port {index + 1} PoE",
+            "poe",
+            "poe",
+            index,
+            port_name,
+            icon="mdi:power-plug",
+        )
+
+    @property
+    def is_on(self) -> bool | None:
+        raw = self._raw_value()
+        return None if raw is None else raw != POE_MODE_OFF
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        await self._async_write(POE_MODE_AUTO)
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        await self._async_write(POE_MODE_OFF)
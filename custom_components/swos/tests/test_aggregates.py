@@ -0,0 +1,68 @@
+# custom_components/swos/tests/test_aggregates.py
+"""Tests for switch-wide throughput / utilisation aggregates."""
+
+
+from custom_components.swos.aggregates import SwOSThroughputTracker, port_counter
+
+
+def _data(rb, tb, rbh=None, spd=None, lnk=None):
+    stats = {"rb": rb, "tb": tb}
+    if rbh is not None:
+        stats["rbh"] = rbh
+    link = {}
+    if spd is not None:
+        link["spd"] = spd
+    if lnk is not None:
+        link["lnk"] = lnk
+    return {"stats": stats, "link": link}
+
+
+def test_port_counter_combines_high_register():
+    stats = {"rb": [5, 7], "rbh": [1, 0]}
+    assert port_counter(stats, "rb", 0) == (1 << 32) + 5
+    assert port_counter(stats, "rb", 1) == 7
+    assert port_counter(stats, "rb", 2) is None
+    assert port_counter({}, "rb", 0) is None
+
+
+def test_first_sample_has_no_rates():
+    tracker = SwOSThroughputTracker()
+    out = tracker.update(_data([0, 0], [0, 0]), now=0.0)
+    assert out["rx_rate"] is None
+    assert out["top_ports"] == []
+    assert tracker.update({"sys": {}}, now=1.0) is None
+
+
+def test_totals_utilisation_and_top_n():
+    tracker = SwOSThroughputTracker(top_n=2)
+    tracker.update(_data([0, 0, 0], [0, 0, 0], spd=[2, 1, 2], lnk=0b111), now=0.0)
+    # 10 s later: port 1 rx 125 MB (100 Mbit/s on 1G), port 2 tx 6.25 MB (5 Mbit/s on 100M)
+    out = tracker.update(
+        _data([125_000_000, 0, 1000], [0, 6_250_000, 0], spd=[2, 1, 2], lnk=0b111), now=10.0
+    )
+    assert out["rx_rate"] == 12_500_100.0
+    assert out["tx_rate"] == 625_000.0
+    assert out["peak_utilisation"] == 10.0
+    assert out["peak_port"] == 1
+    assert [p["port"] for p in out["top_ports"]] == [1, 2]
+
+
+def test_link_down_ports_do_not_count_for_utilisation():
+    tracker = SwOSThroughputTracker()
+    tracker.update(_data([0, 0], [0, 0], spd=[2, 2], lnk=0b01), now=0.0)
+    out = tracker.update(_data([1000, 999_999], [0, 0], spd=[2, 2], lnk=0b01), now=1.0)
+    assert out["peak_port"] == 1
+
+
+def test_counter_wrap_and_reset():
+    tracker = SwOSThroughputTracker()
+    # 32-bit register without high word wraps around
+    tracker.update(_data([(1 << 32) - 10], [0]), now=0.0)
+    out = tracker.update(_data([10], [0]), now=1.0)
+    assert out["rx_rate"] == 20.0
+
+    # with a high word a decrease means the switch was reset -> port skipped
+    tracker = SwOSThroughputTracker()
+    tracker.update(_data([100], [0], rbh=[1]), now=0.0)
+    out = tracker.update(_data([50], [0], rbh=[0]), now=1.0)
+    assert out["rx_rate"] == 0.0
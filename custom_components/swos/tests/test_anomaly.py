@@ -0,0 +1,63 @@
+# custom_components/swos/tests/test_anomaly.py
+"""Tests for the streaming per-port error anomaly detector."""
+
+
+from custom_components.swos.anomaly import SwOSErrorAnomalyDetector
+
+
+def _feed(detector, totals_per_poll, interval=60.0):
+    """Feed cumulative rfcs counters for two ports, one poll per minute."""
+    out = None
+    for n, (p1, p2) in enumerate(totals_per_poll):
+        out = detector.update({"rfcs": [p1, p2]}, now=n * interval)
+    return out
+
+
+def test_steady_errors_are_not_anomalous():
+    detector = SwOSErrorAnomalyDetector(threshold=4.0, min_rate=10.0)
+    # port 1 has a constant background of 20 errors/min
+    out = _feed(detector, [(i * 20, 0) for i in range(10)])
+    assert out["anomalous_ports"] == []
+    assert out["error_rates"] == {1: 20.0}
+
+
+def test_jump_is_flagged_once():
+    detector = SwOSErrorAnomalyDetector(threshold=4.0, min_rate=10.0)
+    totals = [(0, i * 2) for i in range(6)]
+    last = totals[-1][1]
+    totals.append((0, last + 500))
+    out = _feed(detector, totals)
+    assert out["anomalous_ports"] == [2]
+    (new,) = out["new_anomalies"]
+    assert new["port"] == 2 and new["rate"] == 500.0
+    assert new["baseline"] < 2.0
+
+    # still elevated on the next poll: anomalous, but not reported as new again
+    out = detector.update({"rfcs": [0, last + 1000]}, now=7 * 60.0)
+    assert out["anomalous_ports"] == [2]
+    assert out["new_anomalies"] == []
+
+
+def test_small_rates_and_warmup_are_ignored():
+    detector = SwOSErrorAnomalyDetector(threshold=4.0, min_rate=10.0)
+    # below min_rate even though the jump is large relative to zero
+    out = _feed(detector, [(0, 0)] * 5 + [(5, 0)])
+    assert out["anomalous_ports"] == []
+
+    # a burst during warm-up does not trigger
+    detector = SwOSErrorAnomalyDetector(threshold=4.0, min_rate=10.0)
+    out = _feed(detector, [(0, 0), (1000, 0)])
+    assert out["anomalous_ports"] == []
+
+
+def test_counter_reset_is_skipped():
+    detector = SwOSErrorAnomalyDetector()
+    out = _feed(detector, [(100, 0), (200, 0), (5, 0)])
+    assert 1 not in out["error_rates"]
+
+
+def test_high_register_and_multiple_keys_are_summed():
+    detector = SwOSErrorAnomalyDetector(keys=("rfcs", "rae"))
+    detector.update({"rfcs": [0], "rfcsh": [1], "rae": [0]}, now=0.0)
+    out = detector.update({"rfcs": [30], "rfcsh": [1], "rae": [30]}, now=60.0)
+    assert out["error_rates"] == {1: 60.0}
@@ -0,0 +1,215 @@
+# custom_components/swos/tests/test_api.py
+"""Tests for the SwOS blob parser/serialiser and the batched write queue."""
+
+
+import asyncio
+
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.swos.api import SwOSClient, format_swos_blob, parse_swos_blob, port_names
+
+
+def test_parse_sys_scalars():
+    out = parse_swos_blob("{upt:0x0d0f6e61,ip:0x5000a8c0,ver:'322e3138',mac:'d401c3eff705'}")
+    assert out["upt"] == 0x0D0F6E61
+    assert out["ip_str"] == "192.168.0.80"
+    assert out["ver"] == "2.18"
+    assert out["mac"] == "d4:01:c3:ef:f7:05"
+
+
+def test_parse_arrays_do_not_break_keys():
+    out = parse_swos_blob("{en:0x3ffffff,spd:[0x02,0x07,0x01],nm:['506f727431','506f727432'],lnk:0x05}")
+    assert out["en"] == 0x3FFFFFF
+    assert out["spd"] == [2, 7, 1]
+    assert out["nm"] == ["506f727431", "506f727432"]
+    assert out["lnk"] == 5
+
+
+def test_parse_rejects_html():
+    assert parse_swos_blob("<!doctype html><html></html>") == {}
+    assert parse_swos_blob("{a:[]}") == {"a": []}
+
+
+def test_raw_parse_and_format_roundtrip():
+    text = "{en:0x3ffffff,nm:['506f727431','506f727432'],spd:[0x02,0x07],mac:'d401c3eff705'}"
+    raw = parse_swos_blob(text, decode=False)
+    assert raw["mac"] == "d401c3eff705"
+    assert format_swos_blob(raw) == text
+    assert parse_swos_blob(format_swos_blob(raw), decode=False) == raw
+
+
+def test_nested_objects_roundtrip():
+    text = "{en:0x01,sfp:{vnd:'41',pn:['3132','']},nm:['506f727431']}"
+    raw = parse_swos_blob(text, decode=False)
+    assert raw["sfp"] == {"vnd": "41", "pn": ["3132", ""]}
+    assert format_swos_blob(raw) == text
+
+
+def test_port_names():
+    assert port_names({"nm": ["506f727431", "5550"]}) == ["Port1", "UP"]
+    assert port_names({"spd": [0, 0]}) == ["Port1", "Port2"]
+    assert port_names({}) == []
+
+
+class FakeTableClient(SwOSClient):
+    def __init__(self, tables):
+        super().__init__("192.0.2.1", "admin", "pw")
+        self.tables = tables
+        self.posts = []
+        self.refreshed = []
+
+        async def _on_written(sections):
+            self.refreshed.append(sections)
+
+        self.on_written = _on_written
+
+    async def _fetch_one(self, base, decode=True):
+        return dict(self.tables[base])
+
+    async def post_blob(self, endpoint, body):
+        self.posts.append((endpoint, body))
+        return True
+
+
+@pytest.mark.asyncio
+async def test_write_queue_merges_changes_into_one_post(monkeypatch):
+    monkeypatch.setattr("custom_components.swos.api.WRITE_COALESCE_SECONDS", 0.01)
+    client = FakeTableClient({"link": {"en": 0b1111}, "poe": {"poe": [1, 1, 1]}})
+
+    await asyncio.gather(
+        client.queue_write("link", "en", 0, 0),
+        client.queue_write("link", "en", 2, 0),
+        client.queue_write("link", "en", 2, 1),  # later change wins
+        client.queue_write("poe", "poe", 1, 0),
+    )
+
+    assert sorted(client.posts) == [("link.b", "{en:0x0e}"), ("poe.b", "{poe:[0x01,0x00,0x01]}")]
+    assert client.refreshed == [{"link", "poe"}]
+
+
+@pytest.mark.asyncio
+async def test_write_queue_rejects_unknown_field(monkeypatch):
+    monkeypatch.setattr("custom_components.swos.api.WRITE_COALESCE_SECONDS", 0.01)
+    client = FakeTableClient({"link": {"en": 0}})
+    with pytest.raises(HomeAssistantError):
+        await client.queue_write("link", "missing", 0, 1)
+    assert client.posts == []
+
+
+@pytest.mark.asyncio
+async def test_failed_section_does_not_block_the_others(monkeypatch):
+    monkeypatch.setattr("custom_components.swos.api.WRITE_COALESCE_SECONDS", 0.01)
+    client = FakeTableClient({"link": {"en": 0}, "poe": {"poe": [1, 1]}})
+
+    link, poe = await asyncio.gather(
+        client.queue_write("link", "missing", 0, 1),
+        client.queue_write("poe", "poe", 0, 0),
+        return_exceptions=True,
+    )
+
+    assert isinstance(link, HomeAssistantError)
+    assert poe is None
+    assert client.posts == [("poe.b", "{poe:[0x00,0x01]}")]
+    # only what was written is refreshed
+    assert client.refreshed == [{"poe"}]
+
+
+@pytest.mark.asyncio
+async def test_writes_leave_out_status_fields(monkeypatch):
+    monkeypatch.setattr("custom_components.swos.api.WRITE_COALESCE_SECONDS", 0.01)
+    client = FakeTableClient({"link": {"en": 0b11, "lnk": 0b01, "spd": [2, 0], "an": 0b11}})
+    await client.queue_write("link", "en", 1, 0)
+    assert client.posts == [("link.b", "{en:0x01,an:0x03}")]
+
+
+class ScriptedClient(SwOSClient):
+    """Answers GETs from a list of (status, text) per endpoint, in order."""
+
+    def __init__(self, answers):
+        super().__init__("192.0.2.1", "admin", "pw")
+        self.answers = answers
+        self.gets = []
+
+    async def _get(self, endpoint):
+        self.gets.append(endpoint)
+        return self.answers[endpoint].pop(0)
+
+
+@pytest.mark.asyncio
+async def test_failed_requests_do_not_mark_a_section_unsupported():
+    timeout = (None, "")
+    client = ScriptedClient({"poe.b": [timeout, (200, "{poe:[0x01]}")], "!poe.b": [timeout]})
+    assert await client.fetch_section("poe") is None
+    # a network blip: tried again on the next poll
+    assert await client.fetch_section("poe") == {"poe": [1]}
+
+
+@pytest.mark.asyncio
+async def test_sections_answered_with_404_or_html_are_skipped():
+    client = ScriptedClient({"poe.b": [(404, "")], "!poe.b": [(200, "<html></html>")]})
+    assert await client.fetch_section("poe") is None
+    assert await client.fetch_section("poe") is None
+    assert client.gets == ["poe.b", "!poe.b"]
+
+
+@pytest.mark.asyncio
+async def test_host_table_not_served_is_skipped():
+    client = ScriptedClient({"host.b": [(None, ""), (404, "")], "!host.b": [(None, ""), (200, "<html></html>")]})
+    assert await client.fetch_hosts() is None
+    assert await client.fetch_hosts() is None
+    assert await client.fetch_hosts() is None
+    assert client.gets == ["host.b", "!host.b", "host.b", "!host.b"]
+
+
+class SlowScriptedClient(ScriptedClient):
+    async def _get(self, endpoint):
+        await asyncio.sleep(0)
+        return await super()._get(endpoint)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_of_a_table_share_one_request():
+    client = SlowScriptedClient({"link.b": [(200, "{lnk:0x01,spd:[0x02]}"), (200, "{lnk:0x00,spd:[0x02]}")]})
+
+    # e.g. a poll, a link watcher tick and a write queue read at the same time
+    link, section, raw = await asyncio.gather(
+        client.fetch_link(),
+        client.fetch_section("link"),
+        client._fetch_one("link", decode=False),
+    )
+    assert client.gets == ["link.b"]
+    assert link == section == {"lnk": 1, "spd": [2]}
+    assert raw == {"lnk": 1, "spd": [2]}
+
+    # nothing in flight any more: the next read asks the switch again
+    assert (await client.fetch_link())["lnk"] == 0
+    assert client.gets == ["link.b", "link.b"]
+
+
+@pytest.mark.asyncio
+async def test_close_fails_queued_writes(monkeypatch):
+    monkeypatch.setattr("custom_components.swos.api.WRITE_COALESCE_SECONDS", 10)
+    client = FakeTableClient({"link": {"en": 0}})
+    write = asyncio.ensure_future(client.queue_write("link", "en", 0, 1))
+    await asyncio.sleep(0)
+
+    await client.close()
+    with pytest.raises(HomeAssistantError):
+        await write
+    assert client.posts == []
+
+
+@pytest.mark.asyncio
+async def test_writes_go_to_the_endpoint_that_was_read(monkeypatch):
+    monkeypatch.setattr("custom_components.swos.api.WRITE_COALESCE_SECONDS", 0.01)
+    client = ScriptedClient({"poe.b": [(404, "")], "!poe.b": [(200, "{poe:[0x01,0x01]}")]})
+    posts = []
+
+    async def post_blob(endpoint, body):
+        posts.append((endpoint, body))
+        return True
+
+    client.post_blob = post_blob
+    await client.queue_write("poe", "poe", 0, 0)
+    assert posts == [("!poe.b", "{poe:[0x00,0x01]}")]
@@ -0,0 +1,198 @@
+# custom_components/swos/tests/test_coordinator.py
+"""Tests for demand-driven endpoint polling and single-flight refreshes in the coordinator."""
+
+import asyncio
+
+import pytest
+
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.swos.coordinator import SwOSCoordinator
+
+
+class FakeClient:
+    def __init__(self):
+        self.requested = []
+        self.host_fetches = 0
+
+    async def fetch_all(self, sections):
+        sections = list(sections)
+        self.requested.append(sections)
+        return {base: {"x": 1} for base in sections}
+
+    async def fetch_hosts(self):
+        self.host_fetches += 1
+        return "[{adr:'d401c3eff705',prt:0x00,vid:0x01}]"
+
+    def is_unsupported(self, base):
+        return base == "poe"
+
+
+@pytest.mark.asyncio
+async def test_polls_everything_until_demand_is_enabled(hass):
+    client = FakeClient()
+    coordinator = SwOSCoordinator(hass, client, 30)
+    await coordinator.async_refresh()
+    assert client.requested[-1] == ["sys", "link", "stats", "poe"]
+    assert client.host_fetches == 0
+
+
+@pytest.mark.asyncio
+async def test_only_endpoints_of_enabled_entities_are_polled(hass):
+    client = FakeClient()
+    coordinator = SwOSCoordinator(hass, client, 30)
+    await coordinator.async_refresh()
+
+    remove_temp = coordinator.async_register_endpoints(("sys",))
+    remove_agg = coordinator.async_register_endpoints(("link", "stats"))
+    remove_agg2 = coordinator.async_register_endpoints(("link", "stats"))
+    coordinator.async_enable_demand()
+    await hass.async_block_till_done()
+    assert coordinator.sections == ("sys", "link", "stats")
+
+    await coordinator.async_refresh()
+    assert client.requested[-1] == ["sys", "link", "stats"]
+
+    # one of two users disabled: still needed
+    remove_agg()
+    assert coordinator.sections == ("sys", "link", "stats")
+    remove_agg2()
+    assert coordinator.sections == ("sys",)
+    remove_temp()
+    assert coordinator.sections == ("sys",)  # sys is always polled
+
+    await coordinator.async_refresh()
+    assert client.requested[-1] == ["sys"]
+
+
+@pytest.mark.asyncio
+async def test_newly_enabled_endpoint_is_fetched_right_away(hass):
+    client = FakeClient()
+    coordinator = SwOSCoordinator(hass, client, 30)
+    await coordinator.async_refresh()
+    coordinator.async_enable_demand()
+    await hass.async_block_till_done()
+
+    coordinator.async_register_endpoints(("host",))
+    await hass.async_block_till_done()
+    assert client.host_fetches == 1
+    assert coordinator.data["host"]["count"] == 1
+    assert coordinator.hosts.locate("d4:01:c3:ef:f7:05").port == 1
+
+    await coordinator.async_refresh()
+    assert client.requested[-1] == ["sys"]
+    assert client.host_fetches == 2
+
+
+class SlowClient(FakeClient):
+    """Holds every fetch until `release` is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def fetch_all(self, sections):
+        sections = list(sections)
+        self.requested.append(sections)
+        await self.release.wait()
+        return {base: {"rb": [1000]} for base in sections}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_share_one_fetch(hass):
+    client = SlowClient()
+    coordinator = SwOSCoordinator(hass, client, 30)
+
+    calls = [
+        hass.async_create_task(coordinator.async_refresh_stale(["stats"])),
+        hass.async_create_task(coordinator.async_refresh_stale(["stats", "link"])),
+        hass.async_create_task(coordinator.async_refresh_stale(["stats"])),
+    ]
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    client.release.set()
+    await asyncio.gather(*calls)
+
+    # link was not in flight yet for the second call, stats was
+    assert client.requested == [["stats"], ["link"]]
+    assert coordinator.data["stats"] == {"rb": [1000]}
+    assert "link" in coordinator.data
+    assert coordinator._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_shared_blob_is_computed_once(hass):
+    client = SlowClient()
+    client.release.set()
+    coordinator = SwOSCoordinator(hass, client, 30)
+    await coordinator.async_refresh_stale(["stats"])
+    previous = coordinator._throughput._prev
+
+    data = dict(coordinator.data)
+    coordinator._compute(data, ["stats"])
+    # same stats object again: the rate tracker is not fed a zero-length interval
+    assert coordinator._throughput._prev is previous
+    assert data["errors"] is coordinator.data["errors"]
+
+
+@pytest.mark.asyncio
+async def test_max_age_skips_recent_sections(hass):
+    client = FakeClient()
+    coordinator = SwOSCoordinator(hass, client, 30)
+    await coordinator.async_refresh()
+    assert coordinator.section_age("stats") is not None
+
+    assert await coordinator.async_refresh_stale(["sys", "stats"], max_age=60) == []
+    assert len(client.requested) == 1
+
+    coordinator._fetched_at["stats"] -= 120
+    assert await coordinator.async_refresh_stale(["sys", "stats"], max_age=60) == ["stats"]
+    assert client.requested[-1] == ["stats"]
+
+    assert coordinator.section_age("host") is None
+    assert await coordinator.async_refresh_stale(max_age=60) == []
+
+
+@pytest.mark.asyncio
+async def test_energy_is_saved_without_waiting_for_the_delay(hass, hass_storage):
+    coordinator = SwOSCoordinator(hass, FakeClient(), 30)
+    await coordinator.async_load_energy("entry")
+    coordinator._poe_energy.update([10.0], 0.0)
+    coordinator._poe_energy.update([10.0], 360.0)
+
+    await coordinator.async_save_energy()
+    assert hass_storage["swos.poe_energy.entry"]["data"] == {"energy": coordinator._poe_energy.energy}
+
+
+class OfflineClient(FakeClient):
+    async def fetch_all(self, sections):
+        self.requested.append(list(sections))
+        return {}
+
+
+@pytest.mark.asyncio
+async def test_refresh_of_unreachable_sections_fails(hass):
+    coordinator = SwOSCoordinator(hass, FakeClient(), 30)
+    await coordinator.async_refresh()
+    snapshot = coordinator.data
+
+    coordinator.client = OfflineClient()
+    with pytest.raises(UpdateFailed):
+        await coordinator.async_refresh_stale(["sys", "stats"])
+    assert coordinator.data is snapshot
+
+    # sections the switch does not serve are not an error
+    await coordinator.async_refresh_sections(["poe"])
+
+
+@pytest.mark.asyncio
+async def test_partial_refresh_keeps_the_poll_schedule(hass):
+    coordinator = SwOSCoordinator(hass, FakeClient(), 30)
+    await coordinator.async_refresh()
+    remove = coordinator.async_add_listener(lambda: None)
+    scheduled = coordinator._unsub_refresh
+    assert scheduled is not None
+
+    await coordinator.async_refresh_stale(["sys"])
+    assert coordinator._unsub_refresh is scheduled
+    remove()
@@ -0,0 +1,52 @@
+# custom_components/swos/tests/test_energy.py
+"""Tests for incremental PoE power/energy accounting."""
+
+
+import pytest
+
+from custom_components.swos.energy import SwOSPoEEnergyMeter, poe_port_power
+
+
+def test_poe_port_power_scales_deciwatts():
+    assert poe_port_power({"pwr": [0, 55, 123]}) == pytest.approx([0.0, 5.5, 12.3])
+    assert poe_port_power({"poe": [1, 1]}) is None
+
+
+def test_trapezoidal_accumulation():
+    meter = SwOSPoEEnergyMeter()
+    out = meter.update([10.0, 0.0], now=0.0)
+    assert out["energy"] == 0.0
+    assert out["power"] == 10.0
+
+    # 10 W -> 30 W over 6 minutes: mean 20 W * 0.1 h = 0.002 kWh on port 1
+    out = meter.update([30.0, 0.0], now=360.0)
+    assert meter.energy[0] == pytest.approx(0.002)
+
+    # 30 W for 10 minutes = 0.005 kWh; port 2 ramps 0 -> 6 W = 0.0005 kWh
+    out = meter.update([30.0, 6.0], now=960.0)
+    assert out["port_energy"] == [0.007, 0.0005]
+    assert out["energy"] == 0.0075
+    assert out["port_power"] == [30.0, 6.0]
+
+
+def test_long_gaps_are_not_integrated():
+    meter = SwOSPoEEnergyMeter()
+    meter.update([100.0], now=0.0)
+    meter.update([100.0], now=10_000.0)
+    assert meter.energy == [0.0]
+
+
+def test_restore_keeps_totals_and_restarts_integration():
+    meter = SwOSPoEEnergyMeter()
+    meter.update([36.0], now=0.0)
+    meter.update([36.0], now=100.0)
+    stored = meter.as_dict()
+
+    restored = SwOSPoEEnergyMeter.from_dict(stored)
+    assert restored.energy == pytest.approx([0.001])
+    # first sample after a restart only sets the baseline
+    restored.update([36.0], now=50_000.0)
+    assert restored.energy == pytest.approx([0.001])
+
+    assert SwOSPoEEnergyMeter.from_dict(None).energy == []
+    assert SwOSPoEEnergyMeter.from_dict({"energy": "bad"}).energy == []
@@ -0,0 +1,53 @@
+# custom_components/swos/tests/test_hosts.py
+"""Tests for the host.b streaming parser and the incremental MAC index."""
+
+
+from custom_components.swos.hosts import (
+    HostLocation,
+    SwOSHostIndex,
+    iter_host_entries,
+    normalize_mac,
+    parse_mac_list,
+)
+
+HOSTS = "[{adr:'d401c3eff705',prt:0x00,vid:0x01},{adr:'001122334455',prt:0x17,vid:0x0a},{prt:0x01}]"
+
+
+def test_normalize_mac():
+    assert normalize_mac("D4-01-C3-EF-F7-05") == "d4:01:c3:ef:f7:05"
+    assert normalize_mac("d401.c3ef.f705") == "d4:01:c3:ef:f7:05"
+    assert normalize_mac("nope") is None
+
+
+def test_parse_mac_list():
+    assert parse_mac_list("D4:01:C3:EF:F7:05, 001122334455;bad  d401c3eff705") == [
+        "d4:01:c3:ef:f7:05",
+        "00:11:22:33:44:55",
+    ]
+    assert parse_mac_list("") == []
+
+
+def test_iter_host_entries():
+    assert list(iter_host_entries(HOSTS)) == [
+        ("d4:01:c3:ef:f7:05", HostLocation(1, 1)),
+        ("00:11:22:33:44:55", HostLocation(24, 10)),
+    ]
+    assert list(iter_host_entries("<html></html>")) == []
+
+
+def test_index_diff_and_lookup():
+    index = SwOSHostIndex()
+    changes = index.update(HOSTS)
+    assert changes.added == 2 and changes.changed
+    assert index.locate("00:11:22:33:44:55") == HostLocation(24, 10)
+    assert len(index) == 2
+
+    # identical response is skipped
+    assert not index.update(HOSTS).changed
+
+    moved = "[{adr:'d401c3eff705',prt:0x04,vid:0x01},{adr:'aabbccddeeff',prt:0x02,vid:0x01}]"
+    changes = index.update(moved)
+    assert (changes.added, changes.moved, changes.removed) == (1, 1, 1)
+    assert index.locate("d4:01:c3:ef:f7:05") == HostLocation(5, 1)
+    assert "00:11:22:33:44:55" not in index
+    assert index.locate("aa:bb:cc:dd:ee:ff").port == 3
@@ -0,0 +1,77 @@
+# custom_components/swos/tests/test_import_time.py
+"""Import-time budget for the integration package, measured with `python -X importtime`."""
+
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Tuple
+
+ROOT = Path(__file__).resolve().parents[3]
+PACKAGE = "custom_components.swos"
+
+# Home Assistant modules the package needs anyway; imported before the marker
+# so only the integration's own cost is measured.
+PRELOAD = (
+    "homeassistant.config_entries",
+    "homeassistant.core",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.typing",
+)
+MARKER = "-- swos import --"
+
+# cumulative microseconds for `import custom_components.swos`
+BUDGET_US = 25_000
+
+# only loaded on first use (entry setup, first request, requests fallback)
+LAZY = (
+    "httpx",
+    "requests",
+    f"{PACKAGE}.api",
+    f"{PACKAGE}.coordinator",
+    f"{PACKAGE}.link_watcher",
+    f"{PACKAGE}.metrics",
+    f"{PACKAGE}.profiler",
+    f"{PACKAGE}.services",
+)
+
+
+def _measure() -> Tuple[int, Dict[str, int]]:
+    """Return (cumulative us of the package import, {module: self us}) after the marker."""
+    code = (
+        f"import sys\n"
+        f"import {', '.join(PRELOAD)}\n"
+        f"sys.stderr.write({MARKER!r} + '\\n')\n"
+        f"import {PACKAGE}\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    lines = proc.stderr.splitlines()
+    modules: Dict[str, int] = {}
+    total = 0
+    for line in lines[lines.index(MARKER) + 1:]:
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        modules[name] = int(self_us)
+        if name == PACKAGE:
+            total = int(cumulative_us)
+    return total, modules
+
+
+def test_heavy_modules_are_not_imported_with_the_package():
+    _, modules = _measure()
+    assert PACKAGE in modules
+    assert [name for name in modules if name.split(".")[0] in LAZY or name in LAZY] == []
+
+
+def test_package_import_stays_within_budget():
+    # best of three: the first run may also write the bytecode cache
+    total = min(_measure()[0] for _ in range(3))
+    assert 0 < total <= BUDGET_US, f"import {PACKAGE} took {total} us (budget {BUDGET_US} us)"
@@ -0,0 +1,87 @@
+# custom_components/swos/tests/test_link_watcher.py
+"""Tests for the fast link watcher (bitmask diff, events, flap window)."""
+
+
+import pytest
+
+from custom_components.swos.const import EVENT_PORT_LINK_CHANGED
+from custom_components.swos.link_watcher import SwOSLinkWatcher, iter_set_bits
+
+
+class FakeClient:
+    def __init__(self, masks):
+        self._masks = list(masks)
+
+    async def fetch_link(self):
+        return {"lnk": self._masks.pop(0)}
+
+
+def test_iter_set_bits():
+    assert list(iter_set_bits(0)) == []
+    assert list(iter_set_bits(0b1)) == [0]
+    assert list(iter_set_bits(0b1010_0001)) == [0, 5, 7]
+    assert list(iter_set_bits(1 << 25)) == [25]
+
+
+@pytest.mark.asyncio
+async def test_first_mask_is_baseline_without_events(hass):
+    events = []
+    hass.bus.async_listen(EVENT_PORT_LINK_CHANGED, events.append)
+
+    watcher = SwOSLinkWatcher(hass, FakeClient([]), "entry", 5, 60)
+    assert watcher.async_process_mask(0b0111, now=0.0) == []
+    await hass.async_block_till_done()
+
+    assert events == []
+    assert watcher.link_up(1) is True
+    assert watcher.link_up(4) is False
+
+
+@pytest.mark.asyncio
+async def test_transitions_fire_events(hass):
+    events = []
+    hass.bus.async_listen(EVENT_PORT_LINK_CHANGED, events.append)
+
+    watcher = SwOSLinkWatcher(hass, FakeClient([]), "entry", 5, 60)
+    watcher.async_process_mask(0b0011, now=0.0)
+    # port 2 goes down, port 4 comes up
+    assert watcher.async_process_mask(0b1001, now=1.0) == [2, 4]
+    await hass.async_block_till_done()
+
+    by_port = {e.data["port"]: e.data for e in events}
+    assert by_port[2]["old_state"] == "up" and by_port[2]["new_state"] == "down"
+    assert by_port[4]["old_state"] == "down" and by_port[4]["new_state"] == "up"
+    assert by_port[2]["entry_id"] == "entry"
+    assert by_port[2]["timestamp"]
+
+
+@pytest.mark.asyncio
+async def test_flaps_counted_within_window(hass):
+    watcher = SwOSLinkWatcher(hass, FakeClient([]), "entry", 5, 60)
+    notified = []
+    watcher.async_add_listener(lambda: notified.append(True))
+
+    watcher.async_process_mask(0b1, now=0.0)
+    watcher.async_process_mask(0b0, now=10.0)
+    watcher.async_process_mask(0b1, now=20.0)
+    assert watcher.flap_counts() == {1: 2}
+
+    # first transition leaves the window, second one is still inside
+    notified.clear()
+    revision = watcher.revision
+    watcher.async_process_mask(0b1, now=75.0)
+    assert watcher.flap_count(1) == 1
+    assert notified, "listeners must be told when counts decay"
+    assert watcher.revision == revision + 1
+
+    watcher.async_process_mask(0b1, now=200.0)
+    assert watcher.flap_counts() == {}
+
+
+@pytest.mark.asyncio
+async def test_poll_uses_link_bitmask(hass):
+    watcher = SwOSLinkWatcher(hass, FakeClient([0b10, 0b00]), "entry", 5, 60)
+    await watcher._async_poll()
+    await watcher._async_poll()
+    assert watcher.mask == 0
+    assert watcher.flap_count(2) == 1
@@ -0,0 +1,93 @@
+# custom_components/swos/tests/test_metrics.py
+"""Tests for the OpenMetrics exposition of cached coordinator data."""
+
+
+from custom_components.swos.const import DOMAIN
+from custom_components.swos.metrics import SwOSMetricsView, render_metrics
+
+DATA = {
+    "sys": {"temp_c": 42, "uptime_seconds": 366100, "ip_str": "192.168.0.10"},
+    "link": {"lnk": 0b01, "en": 0b11, "spd": [2, 1]},
+    "stats": {"rb": [10, 20], "rbh": [1, 0], "tb": [30, 40], "rfcs": [0, 5]},
+    "throughput": {"rx_rate": 100.0, "tx_rate": 50.0, "peak_utilisation": 12.5},
+    "errors": {"anomalous_ports": [2]},
+}
+
+
+def _lines(text):
+    return text.splitlines()
+
+
+def test_render_metrics_families_and_samples():
+    text = render_metrics([({"device": "sw1"}, DATA, {"up": True, "poll_duration": 0.25, "flaps": {1: 3}})])
+    lines = _lines(text)
+
+    assert lines[-1] == "# EOF"
+    assert "# TYPE swos_port_receive_bytes counter" in lines
+    assert 'swos_up{device="sw1"} 1' in lines
+    assert 'swos_poll_duration_seconds{device="sw1"} 0.25' in lines
+    assert 'swos_uptime_seconds{device="sw1"} 3661.0' in lines
+    assert 'swos_port_link_up{device="sw1",port="2"} 0' in lines
+    assert 'swos_port_speed_mbps{device="sw1",port="1"} 1000' in lines
+    assert f'swos_port_receive_bytes_total{{device="sw1",port="1"}} {(1 << 32) + 10}' in lines
+    assert 'swos_port_errors_total{device="sw1",port="2",kind="rfcs"} 5' in lines
+    assert 'swos_port_error_anomaly{device="sw1",port="2"} 1' in lines
+    assert 'swos_port_link_flaps{device="sw1",port="1"} 3' in lines
+    assert 'swos_peak_port_utilisation_ratio{device="sw1"} 0.125' in lines
+
+    # every family is declared once, before its samples
+    types = [line for line in lines if line.startswith("# TYPE")]
+    assert len(types) == len(set(types))
+
+
+def test_render_metrics_skips_missing_sections_and_escapes_labels():
+    text = render_metrics([({"device": 'a"b'}, {}, {"up": False})])
+    assert _lines(text) == [
+        "# TYPE swos_up gauge",
+        "# HELP swos_up 1 if the last poll of the switch succeeded",
+        'swos_up{device="a\\"b"} 0',
+        "# EOF",
+    ]
+
+
+class FakeCoordinator:
+    def __init__(self, data):
+        self.data = data
+        self.last_update_success = True
+        self.last_poll_duration = 0.1
+
+
+def test_view_caches_until_next_snapshot(hass):
+    coordinator = FakeCoordinator(DATA)
+    hass.data.setdefault(DOMAIN, {})["entry"] = {"coordinator": coordinator}
+    view = SwOSMetricsView(hass)
+
+    first = view.render()
+    assert view.render() is first
+
+    coordinator.data = {**DATA, "sys": {"temp_c": 50}}
+    second = view.render()
+    assert second is not first
+    assert 'swos_temperature_celsius{entry_id="entry",device="entry",ip=""} 50' in _lines(second)
+
+
+class FakeWatcher:
+    def __init__(self):
+        self.revision = 0
+        self.flaps = {}
+
+    def flap_counts(self):
+        return self.flaps
+
+
+def test_view_rerenders_when_flaps_change(hass):
+    watcher = FakeWatcher()
+    hass.data.setdefault(DOMAIN, {})["entry"] = {"coordinator": FakeCoordinator(DATA), "link_watcher": watcher}
+    view = SwOSMetricsView(hass)
+    first = view.render()
+
+    watcher.flaps = {1: 2}
+    watcher.revision += 1
+    second = view.render()
+    assert second is not first
+    assert 'swos_port_link_flaps{entry_id="entry",device="entry",ip="192.168.0.10",port="1"} 2' in _lines(second)
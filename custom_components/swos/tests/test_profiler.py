@@ -0,0 +1,137 @@
+# custom_components/swos/tests/test_profiler.py
+"""Tests for the on-demand refresh profiler."""
+
+
+import tracemalloc
+
+import pytest
+
+from custom_components.swos.api import active_profiler
+from custom_components.swos.coordinator import SwOSCoordinator
+from custom_components.swos.profiler import SwOSProfiler
+
+
+class FakeClient:
+    def __init__(self):
+        self.profiler = None
+
+    def set_profiler(self, profiler):
+        self.profiler = profiler
+
+    async def fetch_all(self, sections=()):
+        profiler = active_profiler.get()
+        if profiler is not None:
+            profiler.add("fetch_blob", 0.010)
+            profiler.add("parse_swos_blob", 0.001)
+        return {"sys": {"temp_c": 40}}
+
+    async def fetch_hosts(self):
+        return None
+
+
+def test_profiler_cycles_and_summary():
+    profiler = SwOSProfiler(cycles=2)
+    profiler.add("fetch_blob", 1.0)  # outside a cycle: ignored
+    for _ in range(2):
+        profiler.start_cycle()
+        profiler.add("fetch_blob", 0.020)
+        profiler.add("fetch_blob", 0.010)
+        profiler.add("auth", 0.005)
+        profiler.end_cycle()
+    assert profiler.done
+
+    summary = profiler.summary()
+    # known stages come in pipeline order
+    assert summary[0].startswith("auth: 5.0 ms/cycle (2 calls)")
+    assert summary[1].startswith("fetch_blob: 30.0 ms/cycle (4 calls)")
+    assert summary[-1].startswith("total:")
+
+    report = profiler.report("title")
+    assert report.startswith("title\ncycles: 2, mode: timing")
+    assert "#2: total" in report
+
+
+def test_profiler_cprofile_section():
+    profiler = SwOSProfiler(cycles=1, mode="cprofile")
+    profiler.start_cycle()
+    sum(range(1000))
+    profiler.end_cycle()
+    assert "cProfile of SwOSCoordinator._async_update_data" in profiler.report("t")
+
+    with pytest.raises(ValueError):
+        SwOSProfiler(mode="perf")
+
+
+@pytest.mark.asyncio
+async def test_coordinator_profiles_next_cycles_only(hass, tmp_path):
+    hass.config.config_dir = str(tmp_path)
+    client = FakeClient()
+    coordinator = SwOSCoordinator(hass, client, 30)
+
+    coordinator.async_start_profile(2, "timing")
+    assert client.profiler is coordinator.profiler
+
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    # detached again after the requested cycles
+    assert coordinator.profiler is None
+    assert client.profiler is None
+
+    reports = list(tmp_path.glob("swos_profile_*.txt"))
+    assert len(reports) == 1
+    text = reports[0].read_text()
+    assert "fetch_blob: 10.0 ms/cycle (2 calls)" in text
+    assert "compute:" in text
+
+
+def test_stop_releases_tracemalloc():
+    profiler = SwOSProfiler(cycles=3, mode="tracemalloc")
+    profiler.start_cycle()
+    assert tracemalloc.is_tracing()
+    profiler.stop()
+    assert not tracemalloc.is_tracing()
+    assert not profiler.in_cycle
+
+
+@pytest.mark.asyncio
+async def test_only_refresh_fetches_are_profiled(hass):
+    client = FakeClient()
+    coordinator = SwOSCoordinator(hass, client, 30)
+    coordinator.async_start_profile(2, "tracemalloc")
+    profiler = coordinator.profiler
+    profiler.start_cycle()
+
+    # e.g. a link watcher poll while the cycle is open
+    await client.fetch_all(["link"])
+    assert profiler._current == {}
+
+    # a new run replaces the old one and takes over tracemalloc cleanly
+    coordinator.async_start_profile(1, "timing")
+    assert not tracemalloc.is_tracing()
+    coordinator.async_stop_profile()
+    assert coordinator.profiler is None
+    assert client.profiler is None
+
+
+@pytest.mark.asyncio
+async def test_partial_refresh_does_not_end_the_cycle(hass, tmp_path):
+    hass.config.config_dir = str(tmp_path)
+    client = FakeClient()
+    coordinator = SwOSCoordinator(hass, client, 30)
+    coordinator.async_start_profile(1, "timing")
+    profiler = coordinator.profiler
+    # as if a poll were waiting for the switch
+    profiler.start_cycle()
+
+    # e.g. the refresh after a write, while that poll is still running
+    await coordinator.async_refresh_sections(["sys"])
+    assert profiler.in_cycle
+    assert profiler._current == {}
+    assert coordinator.profiler is profiler
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert coordinator.profiler is None
+    assert len(profiler.results) == 1
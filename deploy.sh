@@ -8,9 +8,10 @@ fi
 # 1. ak neexistuje slozka, vyrobi slozku swos_release
 mkdir -p swos_release
 
-# 2. skopiruje .py a .json subory z ./swos do slozky swos_release
+# 2. skopiruje .py, .json a .yaml subory z ./swos do slozky swos_release
 cp ./custom_components/swos/*.py ./swos_release/
 cp ./custom_components/swos/*.json ./swos_release/
+cp ./custom_components/swos/*.yaml ./swos_release/
 cp ./custom_components/swos/*.png ./swos_release/
 
 # 3. vyrobi swos.zip zo swos_release